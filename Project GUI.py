@@ -1,68 +1,42 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sqlite3
-import hashlib
 import os
 import logging
-from database import Database
-
-logging.basicConfig(filename = 'app.log', level = logging.ERROR,
-                    format = '%(asctime)s %(levelname)s %(message)s')
-
-class QuizApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Aplikasi Kuis - Login/Registrasi")
-        
-        self.root.minsize(300, 200)
-
-        # Inisialisasi Style
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-
-        # Path ke subfolder dan file database
-        self.DATA_FOLDER = 'database'
-        self.DB_PATH = os.path.join(self.DATA_FOLDER, 'users.db')
-
-        # Inisialisasi Database
-        self.init_db()
-
-        # Membuat UI utama
-        self.create_main_ui()
-
-    def init_db(self):
-        if not os.path.exists(self.DATA_FOLDER):
-            os.makedirs(self.DATA_FOLDER)
-
-        with sqlite3.connect(self.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL
-                )
-            ''')
-            conn.commit()
-
-    def create_main_ui(self):
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
-
-        label_title = ttk.Label(main_frame, text="Selamat Datang!", font=("Arial", 16))
-        label_title.pack(pady=20)
-
-        button_login = ttk.Button(main_frame, text="Login", width=15, command=self.open_login_window)
-        button_login.pack(pady=10)
-
-        button_register = ttk.Button(main_frame, text="Registrasi", width=15, command=self.open_register_window)
-        button_register.pack(pady=10)
-
-    def open_register_window(self):
-        RegisterWindow(self)
-
-    def open_login_window(self):
-        LoginWindow(self)
+import threading
+from database import Database, DATA_FOLDER, USERS_DB_PATH, QUESTIONS_DB_PATH
+from database import auth
+from database import questions as question_store
+from database import stats
+from database.selection import DEFAULT_QUIZ_SIZE, list_categories
+from database.maintenance import BACKUP_FOLDER, MaintenanceScheduler
+from database.ratelimit import LoginLimiter
+from database.schema import migrate_users_db
+from database.transfer import import_questions, export_questions
+from database.worker import DatabaseWorker
+from profiling import profiled
+from quiz_engine import QuizEngine
+from telemetry import log_event, metrics, setup_logging, stop_logging
+
+
+class BusyIndicator:
+    """Progressbar yang tampil selama masih ada job database yang berjalan."""
+
+    def __init__(self, parent):
+        self.bar = ttk.Progressbar(parent, mode='indeterminate', length=120)
+        self.count = 0
+
+    def start(self):
+        self.count += 1
+        if self.count == 1:
+            self.bar.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor='se')
+            self.bar.start(10)
+
+    def stop(self):
+        self.count = max(self.count - 1, 0)
+        if self.count == 0:
+            self.bar.stop()
+            self.bar.place_forget()
 
 
 class RegisterWindow:
@@ -72,9 +46,6 @@ class RegisterWindow:
         self.register_window.title("Registrasi")
         self.register_window.minsize(350, 300)
 
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-
         reg_frame = ttk.Frame(self.register_window)
         reg_frame.pack(expand=True, fill='both', padx=10, pady=10)
 
@@ -102,6 +73,9 @@ class RegisterWindow:
         button_submit = ttk.Button(reg_frame, text="Daftar", command=self.submit_registration)
         button_submit.pack(pady=20)
 
+        self.indicator = BusyIndicator(self.register_window)
+
+    @profiled
     def submit_registration(self):
         username = self.entry_username.get().strip()
         password = self.entry_password.get().strip()
@@ -124,27 +98,30 @@ class RegisterWindow:
             messagebox.showerror("Error", "Username hanya boleh mengandung huruf dan angka.")
             return
 
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-
-        try:
-            with sqlite3.connect(self.app.DB_PATH) as conn:
-                cursor = conn.cursor()
-                cursor.execute('INSERT INTO users (username, password) VALUES (?, ?)', (username, hashed_password))
-                conn.commit()
-            messagebox.showinfo("Sukses", "Registrasi berhasil! Anda dapat login sekarang.")
-            self.register_window.destroy()
-        except sqlite3.IntegrityError as e:
+        # Hashing (scrypt/PBKDF2) dan INSERT dijalankan di thread worker
+        self.app.worker.submit(auth.register_user, self.app.users_db, username, password,
+                               on_success=self.registration_done, on_error=self.registration_failed,
+                               db=self.app.users_db, indicator=self.indicator, owner=self.register_window)
+
+    def registration_done(self, result):
+        metrics.increment('registrations')
+        log_event('register', ok=True, username=self.entry_username.get().strip())
+        messagebox.showinfo("Sukses", "Registrasi berhasil! Anda dapat login sekarang.")
+        self.register_window.destroy()
+
+    def registration_failed(self, e):
+        if isinstance(e, sqlite3.IntegrityError):
+            # Bukan kesalahan sistem: cukup dihitung, bukan dicatat sebagai error
+            metrics.increment('registrations.duplicate')
+            log_event('register', ok=False, reason='duplicate_username',
+                      username=self.entry_username.get().strip())
             messagebox.showerror("Error", "Username sudah digunakan. Silakan pilih username lain.")
-            logging.error(f"Username sudah ada di database: {e}")
-        except sqlite3.OperationalError as e:
+        elif isinstance(e, sqlite3.OperationalError):
             messagebox.showerror("Error", "Gagal menyimpan data ke database.")
             logging.error(f"Database error: {e}")
-        except sqlite3.Error as e:
+        else:
             logging.error(f"Database error saat registrasi: {e}")
             messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
-        else:
-            messagebox.showinfo("Info", "Registrasi berhasil!")
-            self.register_window.destroy()
 
 
 class LoginWindow:
@@ -191,55 +168,79 @@ class LoginWindow:
         button_login = ttk.Button(frame_center, text="Login", command=self.submit_login)    
         button_login.grid(row=2, column=0, pady=20)
 
+        self.indicator = BusyIndicator(self.login_window)
+
+    @profiled
     def submit_login(self):
         username = self.entry_username.get().strip()
         password = self.entry_password.get().strip()
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-
-        try:
-            with sqlite3.connect(self.app.DB_PATH) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT password FROM users WHERE username = ? ', (username,))
-                stored_hashed_passwrod = cursor.fetchone()[0]
-                
-
-                if stored_hashed_passwrod == hashed_password:
-                    messagebox.showinfo("Sukses", "Login berhasil!")
-                    self.login_window.destroy()
-                else:
-                    messagebox.showerror("Error", "Username atau password salah.")
-        except sqlite3.Error as e:
-            logging.error(f"Database error saat login: {e}")
-            messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")        
-        if username and password:
-            messagebox.showinfo("Info", "Login dicoba!")
-        else:
-            messagebox.showerror("Error", "Semua field harus diisi.")
-
-
 
+        # Input kosong dan percobaan yang melewati batas laju ditolak sebelum hashing atau query database
+        invalid = auth.check_login_input(username, password, self.app.login_limiter)
+        if invalid is not None:
+            self.show_login_result(invalid, username)
+            return
 
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizApp(root)
-    root.mainloop()
+        self.app.worker.submit(auth.login, self.app.users_db, username, password, self.app.login_limiter,
+                               checked=True,
+                               on_success=lambda result: self.show_login_result(result, username),
+                               on_error=self.login_failed,
+                               db=self.app.users_db, indicator=self.indicator, owner=self.login_window)
+
+    def show_login_result(self, result, username):
+        metrics.increment('logins.ok' if result.ok else 'logins.failed')
+        log_event('login', ok=result.ok, username=username, user_id=result.user_id)
+        if result.ok:
+            self.app.set_user(result.user_id, username)
+            messagebox.showinfo("Sukses", result.message)
+            self.login_window.destroy()
+        else:
+            messagebox.showerror("Error", result.message)
 
+    def login_failed(self, e):
+        logging.error(f"Database error saat login: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
 
 
 class ManageQuestionsWindow:
+    # Jumlah baris per halaman dan batas baris yang disimpan di Treeview
+    PAGE_SIZE = 100
+    MAX_ROWS = 300
+
     def __init__(self, app):
         self.app = app
         self.window = tk.Toplevel(app.root)
         self.window.title("Kelola Soal")
         self.window.minsize(400, 400)
 
+        # Kotak pencarian (FTS5), hasil diperbarui saat mengetik
+        search_frame = ttk.Frame(self.window)
+        search_frame.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(search_frame, text="Cari:").pack(side='left')
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side='left', expand=True, fill='x', padx=5)
+        self.search_var.trace_add('write', self.on_search_changed)
+        self.search_query = ''
+        self._search_after = None
+
         # Tabel soal
-        self.tree = ttk.Treeview(self.window, columns=("ID", "Soal", "Jawaban", "Opsi"), show="headings")
+        table_frame = ttk.Frame(self.window)
+        table_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+        self.tree = ttk.Treeview(table_frame, columns=("ID", "Soal", "Jawaban", "Opsi"), show="headings")
         self.tree.heading("ID", text="ID")
         self.tree.heading("Soal", text="Soal")
         self.tree.heading("Jawaban", text="Jawaban")
         self.tree.heading("Opsi", text="Opsi")
-        self.tree.pack(expand=True, fill='both', padx=10, pady=10)
+
+        self.scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', expand=True, fill='both')
+
+        self.at_start = True
+        self.at_end = False
+        self._paging = False
 
         # Tombol CRUD
         button_frame = ttk.Frame(self.window)
@@ -248,28 +249,145 @@ class ManageQuestionsWindow:
         ttk.Button(button_frame, text="Tambah Soal", command=self.add_question).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Edit Soal", command=self.edit_question).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Hapus Soal", command=self.delete_question).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Impor", command=self.import_file).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Ekspor", command=self.export_file).pack(side="left", padx=5)
+
+        self.button_cancel = ttk.Button(button_frame, text="Batal", command=self.cancel_transfer)
+
+        self.label_status = ttk.Label(self.window, text="")
+        self.label_status.pack(fill='x', padx=10, pady=(0, 10))
+        self.indicator = BusyIndicator(self.window)
+        self.page_job = None
+        self.transfer_job = None
+        self.transfer_cancel = threading.Event()
 
         self.load_questions()
 
     def load_questions(self):
-        """Memuat soal dari database dan menampilkan di tabel."""
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        """Memuat halaman pertama soal dari database dan menampilkan di tabel."""
+        if self.page_job is not None:
+            self.page_job.cancel()
+        self.tree.delete(*self.tree.get_children())
+
+        self.at_start = True
+        self.at_end = False
+        self._paging = True
+        self.load_next_page()
+
+    def fetch_page(self, after_id=None, before_id=None, search=None):
+        """Mengambil satu halaman soal dengan keyset pagination pada id; halaman yang sama diambil dari cache."""
+        return self.app.engine.cache.cached(
+            ('rows', after_id, before_id, self.PAGE_SIZE, search),
+            lambda: question_store.fetch_question_rows(self.app.db, after_id=after_id, before_id=before_id,
+                                                       limit=self.PAGE_SIZE, search=search))
+
+    def submit_page(self, on_success, **kwargs):
+        self.page_job = self.app.worker.submit(self.fetch_page, on_success=on_success, on_error=self.page_failed,
+                                               db=self.app.db, indicator=self.indicator, owner=self.window,
+                                               search=self.search_query, **kwargs)
+
+    def on_search_changed(self, *args):
+        """Menunda pencarian sampai pengguna berhenti mengetik sebentar."""
+        if self._search_after is not None:
+            self.window.after_cancel(self._search_after)
+        self._search_after = self.window.after(250, self.apply_search)
+
+    def apply_search(self):
+        self._search_after = None
+        query = self.search_var.get().strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.load_questions()
+
+    def page_failed(self, e):
+        self._paging = False
+        logging.error(f"Database error saat memuat soal: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
+
+    def on_tree_scroll(self, first, last):
+        """Memuat halaman berikut/sebelumnya saat tabel digulir mendekati tepi."""
+        self.scrollbar.set(first, last)
+        if self._paging:
+            return
+        if float(last) >= 0.98 and not self.at_end:
+            self._paging = True
+            self.window.after_idle(self.load_next_page)
+        elif float(first) <= 0.02 and not self.at_start:
+            self._paging = True
+            self.window.after_idle(self.load_previous_page)
+
+    def top_visible_item(self):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        index = int(float(self.tree.yview()[0]) * len(children))
+        return children[min(index, len(children) - 1)]
+
+    def restore_position(self, anchor):
+        """Menggulir tabel agar baris anchor kembali berada di posisi atas."""
+        children = self.tree.get_children()
+        if anchor is None or not children or not self.tree.exists(anchor):
+            return
+        self.tree.yview_moveto(self.tree.index(anchor) / len(children))
 
-        with sqlite3.connect(self.app.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("CREATE TABLE IF NOT EXISTS questions (id INTEGER PRIMARY KEY, question TEXT, answer TEXT, options TEXT)")
-            conn.commit()
+    def load_next_page(self):
+        """Mengambil satu halaman di bawah baris terakhir di latar belakang."""
+        children = self.tree.get_children()
+        self.submit_page(self.append_page, after_id=int(children[-1]) if children else None)
 
-            cursor.execute("SELECT * FROM questions")
-            rows = cursor.fetchall()
+    def append_page(self, rows):
+        """Menambah satu halaman di bawah dan membuang baris teratas yang berlebih."""
+        try:
+            anchor = self.top_visible_item()
+            if len(rows) < self.PAGE_SIZE:
+                self.at_end = True
             for row in rows:
-                self.tree.insert('', 'end', values=row)
+                if not self.tree.exists(str(row[0])):
+                    self.tree.insert('', 'end', iid=str(row[0]), values=row)
+
+            children = self.tree.get_children()
+            excess = len(children) - self.MAX_ROWS
+            if excess > 0:
+                self.tree.delete(*children[:excess])
+                self.at_start = False
+                self.restore_position(anchor)
+        finally:
+            self._paging = False
+
+    def load_previous_page(self):
+        """Mengambil satu halaman di atas baris pertama di latar belakang."""
+        children = self.tree.get_children()
+        if not children:
+            self.at_start = True
+            self._paging = False
+            return
+        self.submit_page(self.prepend_page, before_id=int(children[0]))
 
+    def prepend_page(self, rows):
+        """Menambah satu halaman di atas dan membuang baris terbawah yang berlebih."""
+        try:
+            anchor = self.top_visible_item()
+            if len(rows) < self.PAGE_SIZE:
+                self.at_start = True
+            for row in reversed(rows):
+                if not self.tree.exists(str(row[0])):
+                    self.tree.insert('', 0, iid=str(row[0]), values=row)
+
+            children = self.tree.get_children()
+            excess = len(children) - self.MAX_ROWS
+            if excess > 0:
+                self.tree.delete(*children[-excess:])
+                self.at_end = False
+            self.restore_position(anchor)
+        finally:
+            self._paging = False
+
+    @profiled
     def add_question(self):
         """Menambah soal baru."""
         AddQuestionWindow(self)
 
+    @profiled
     def edit_question(self):
         """Mengedit soal yang dipilih."""
         selected_item = self.tree.selection()
@@ -280,6 +398,7 @@ class ManageQuestionsWindow:
         item = self.tree.item(selected_item[0])['values']
         EditQuestionWindow(self, item)
 
+    @profiled
     def delete_question(self):
         """Menghapus soal yang dipilih."""
         selected_item = self.tree.selection()
@@ -288,14 +407,108 @@ class ManageQuestionsWindow:
             return
 
         item = self.tree.item(selected_item[0])['values']
-        with sqlite3.connect(self.app.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM questions WHERE id = ?", (item[0],))
-            conn.commit()
-
-        self.tree.delete(selected_item[0])
+        self.app.worker.submit(question_store.delete_question, self.app.db, item[0],
+                               on_success=lambda _: self.question_deleted(selected_item[0]),
+                               on_error=self.database_error,
+                               db=self.app.db, indicator=self.indicator, owner=self.window)
+
+    def question_deleted(self, iid):
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
         messagebox.showinfo("Info", "Soal berhasil dihapus!")
 
+    def database_error(self, e):
+        logging.error(f"Database error: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
+
+    @profiled
+    def import_file(self):
+        """Mengimpor soal dari file CSV/JSON di latar belakang."""
+        path = filedialog.askopenfilename(parent=self.window, filetypes=[
+            ("Bank soal", "*.csv *.json *.jsonl"), ("Semua file", "*.*")])
+        if path:
+            self.start_transfer(import_questions, path, lambda done, bad: f"{done} soal diimpor, {bad} dilewati")
+
+    @profiled
+    def export_file(self):
+        """Mengekspor seluruh soal ke file CSV/JSON di latar belakang."""
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".csv", filetypes=[
+            ("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")])
+        if path:
+            self.start_transfer(export_questions, path, lambda done: f"{done} soal diekspor")
+
+    def start_transfer(self, transfer, path, describe):
+        if self.transfer_job is not None:
+            messagebox.showerror("Error", "Impor/ekspor lain sedang berjalan.")
+            return
+
+        def progress(*counts):
+            self.app.worker.post(self.label_status.configure, {'text': describe(*counts)})
+
+        self.transfer_cancel.clear()
+        self.label_status.configure(text="Memproses...")
+        self.button_cancel.pack(side="left", padx=5)
+        self.transfer_job = self.app.worker.submit(
+            transfer, self.app.db, path, progress=progress, cancelled=self.transfer_cancel.is_set,
+            on_success=self.transfer_done, on_error=self.transfer_failed,
+            db=self.app.db, indicator=self.indicator, owner=self.window)
+
+    @profiled
+    def cancel_transfer(self):
+        if self.transfer_job is None:
+            return
+        self.transfer_cancel.set()
+        self.transfer_job.cancel()
+        self.transfer_job = None
+        self.button_cancel.pack_forget()
+        self.label_status.configure(text="Dibatalkan.")
+        self.load_questions()
+
+    def transfer_done(self, result):
+        self.transfer_job = None
+        self.button_cancel.pack_forget()
+        self.label_status.configure(text="Selesai.")
+        self.load_questions()
+
+    def transfer_failed(self, e):
+        self.transfer_job = None
+        self.button_cancel.pack_forget()
+        logging.error(f"Impor/ekspor gagal: {e}")
+        self.label_status.configure(text="")
+        messagebox.showerror("Error", f"Impor/ekspor gagal: {e}")
+
+    def insert_question_row(self, row):
+        """Menambahkan satu baris soal baru ke tabel tanpa memuat ulang."""
+        # Soal baru selalu memiliki id terbesar; jika halaman terakhir belum
+        # dimuat, baris ini akan muncul sendiri saat tabel digulir ke bawah.
+        # Saat mencari, soal baru belum tentu cocok sehingga tidak ditambahkan.
+        if not self.at_end or self.search_query:
+            return
+        self.tree.insert('', 'end', iid=str(row[0]), values=row)
+        self.tree.see(str(row[0]))
+
+    def update_question_row(self, row):
+        """Memperbarui satu baris soal di tabel tanpa memuat ulang."""
+        if self.tree.exists(str(row[0])):
+            self.tree.item(str(row[0]), values=row)
+
+def read_options(text_widget):
+    """Membaca opsi dari widget Text, satu opsi per baris."""
+    lines = text_widget.get('1.0', 'end').splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def validate_question(question, answer, options):
+    """Mengembalikan pesan error, atau None jika soal valid."""
+    if not question or not answer or not options:
+        return "Semua field harus diisi."
+    if len(set(options)) != len(options):
+        return "Setiap opsi harus berbeda."
+    if answer not in options:
+        return "Jawaban harus sama dengan salah satu opsi."
+    return None
+
+
 class AddQuestionWindow:
     def __init__(self, manage_window):
         self.manage_window = manage_window
@@ -311,29 +524,41 @@ class AddQuestionWindow:
         self.entry_answer = ttk.Entry(self.window)
         self.entry_answer.pack(fill='x', padx=10)
 
-        ttk.Label(self.window, text="Opsi (pisahkan dengan koma):").pack(pady=5)
-        self.entry_options = ttk.Entry(self.window)
+        ttk.Label(self.window, text="Opsi (satu opsi per baris):").pack(pady=5)
+        self.entry_options = tk.Text(self.window, height=5)
         self.entry_options.pack(fill='x', padx=10)
 
+        ttk.Label(self.window, text="Kategori (opsional):").pack(pady=5)
+        self.entry_category = ttk.Entry(self.window)
+        self.entry_category.pack(fill='x', padx=10)
+
         ttk.Button(self.window, text="Simpan", command=self.save_question).pack(pady=20)
 
+        self.indicator = BusyIndicator(self.window)
+
+    @profiled
     def save_question(self):
         """Menyimpan soal baru ke database."""
         question = self.entry_question.get().strip()
         answer = self.entry_answer.get().strip()
-        options = self.entry_options.get().strip()
+        options = read_options(self.entry_options)
+        category = self.entry_category.get().strip()
 
-        if not question or not answer or not options:
-            messagebox.showerror("Error", "Semua field harus diisi.")
+        error = validate_question(question, answer, options)
+        if error:
+            messagebox.showerror("Error", error)
             return
 
-        with sqlite3.connect(self.manage_window.app.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO questions (question, answer, options) VALUES (?, ?, ?)", (question, answer, options))
-            conn.commit()
+        app = self.manage_window.app
+        app.worker.submit(question_store.insert_question, app.db, question, answer, options, category,
+                          on_success=lambda question_id: self.question_saved(
+                              (question_id, question, answer, " | ".join(options))),
+                          on_error=self.manage_window.database_error,
+                          db=app.db, indicator=self.indicator, owner=self.window)
 
+    def question_saved(self, row):
         messagebox.showinfo("Info", "Soal berhasil ditambahkan!")
-        self.manage_window.load_questions()
+        self.manage_window.insert_question_row(row)
         self.window.destroy()
 
 class EditQuestionWindow:
@@ -356,172 +581,513 @@ class EditQuestionWindow:
         self.entry_answer.insert(0, selected_question[2])
         self.entry_answer.pack(fill='x', padx=10)
 
-        ttk.Label(self.window, text="Opsi (pisahkan dengan koma):").pack(pady=5)
-        self.entry_options = ttk.Entry(self.window)
-        self.entry_options.insert(0, selected_question[3])
+        ttk.Label(self.window, text="Opsi (satu opsi per baris):").pack(pady=5)
+        self.entry_options = tk.Text(self.window, height=5)
         self.entry_options.pack(fill='x', padx=10)
 
+        ttk.Label(self.window, text="Kategori (opsional):").pack(pady=5)
+        self.entry_category = ttk.Entry(self.window)
+        self.entry_category.pack(fill='x', padx=10)
+
         ttk.Button(self.window, text="Simpan Perubahan", command=self.save_changes).pack(pady=20)
 
+        self.indicator = BusyIndicator(self.window)
+        app = manage_window.app
+        app.worker.submit(question_store.load_question_details, app.db, selected_question[0],
+                          on_success=self.show_details, on_error=manage_window.database_error,
+                          db=app.db, indicator=self.indicator, owner=self.window)
+
+    def show_details(self, details):
+        category, options = details
+        self.entry_options.insert('1.0', "\n".join(text for _, text, _ in options))
+        self.entry_category.insert(0, category or '')
+
+    @profiled
     def save_changes(self):
         """Menyimpan perubahan pada soal yang diedit."""
         question_id = self.selected_question[0]
         updated_question = self.entry_question.get().strip()
         updated_answer = self.entry_answer.get().strip()
-        updated_options = self.entry_options.get().strip()
+        updated_options = read_options(self.entry_options)
+        updated_category = self.entry_category.get().strip()
 
-        if not updated_question or not updated_answer or not updated_options:
-            messagebox.showerror("Error", "Semua field harus diisi.")
+        error = validate_question(updated_question, updated_answer, updated_options)
+        if error:
+            messagebox.showerror("Error", error)
             return
 
-        with sqlite3.connect(self.manage_window.app.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE questions
-                SET question = ?, answer = ?, options = ?
-                WHERE id = ?
-            """, (updated_question, updated_answer, updated_options, question_id))
-            conn.commit()
+        app = self.manage_window.app
+        app.worker.submit(question_store.update_question, app.db, question_id,
+                          updated_question, updated_answer, updated_options, updated_category,
+                          on_success=lambda updated: self.changes_saved(
+                              updated, (question_id, updated_question, updated_answer, " | ".join(updated_options))),
+                          on_error=self.manage_window.database_error,
+                          db=app.db, indicator=self.indicator, owner=self.window)
+
+    def changes_saved(self, updated, row):
+        question_id = row[0]
+        if not updated:
+            messagebox.showerror("Error", "Soal sudah tidak ada di database.")
+            if self.manage_window.tree.exists(str(question_id)):
+                self.manage_window.tree.delete(str(question_id))
+            self.window.destroy()
+            return
 
-        self.manage_window.load_questions()
+        self.manage_window.update_question_row(row)
         messagebox.showinfo("Sukses", "Soal berhasil diperbarui!")
         self.window.destroy()
 
-class QuizApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Aplikasi Pengelolaan Soal Kuis")
-        self.root.minsize(400, 300)
-
-        # Path database
-        self.DATA_FOLDER = 'database'
-        self.DB_PATH = os.path.join(self.DATA_FOLDER, 'questions.db')
-
-        # Tombol untuk membuka pengelolaan soal
-        ttk.Button(self.root, text="Kelola Soal", command=self.open_manage_questions).pack(pady=20)
-
-    def open_manage_questions(self):
-        """Membuka jendela pengelolaan soal."""
-        ManageQuestionsWindow(self)
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizApp(root)
-    root.mainloop()
-
 class PlayQuizWindow:
+    # Selang waktu penulisan jawaban yang tertunda ke database
+    FLUSH_MS = 5000
+    # Selang pengecekan saat soal berikutnya belum selesai dibaca dari database
+    NEXT_POLL_MS = 50
+
     def __init__(self, app):
         self.app = app
         self.window = tk.Toplevel(app.root)
         self.window.title("Mulai Kuis")
         self.window.minsize(400, 300)
 
-        self.current_question_index = 0
-        self.score = 0
-        self.questions = []
-
-        # Memuat soal dari database
-        self.load_questions()
-
-        if not self.questions:
+        # State kuis (nomor soal, skor) disimpan di QuizSession
+        self.session = None
+        # id timer after() untuk flush berkala dan untuk menunggu soal berikutnya,
+        # dibatalkan saat jendela ditutup
+        self.flush_timer = None
+        self.next_timer = None
+
+        self.indicator = BusyIndicator(self.window)
+        self.window.bind('<Destroy>', self.on_destroy)
+
+        # Pilihan mode kuis sebelum soal dimuat
+        self.create_setup_view()
+
+    def create_setup_view(self):
+        self.setup_frame = ttk.Frame(self.window)
+        self.setup_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+        ttk.Label(self.setup_frame, text="Mode Kuis", font=("Arial", 14)).pack(pady=10)
+        self.mode = tk.StringVar(value='all')
+        for value, text in (('all', "Semua soal"), ('random', "Soal acak"),
+                            ('category', "Soal dari kategori"), ('weighted', "Utamakan soal sulit")):
+            ttk.Radiobutton(self.setup_frame, text=text, value=value, variable=self.mode).pack(anchor='w', padx=20)
+
+        form = ttk.Frame(self.setup_frame)
+        form.pack(pady=10)
+        ttk.Label(form, text="Jumlah soal:").grid(row=0, column=0, padx=5, pady=5, sticky='e')
+        self.count_var = tk.StringVar(value=str(DEFAULT_QUIZ_SIZE))
+        ttk.Spinbox(form, from_=1, to=100, textvariable=self.count_var, width=5).grid(
+            row=0, column=1, padx=5, pady=5, sticky='w')
+        ttk.Label(form, text="Kategori:").grid(row=1, column=0, padx=5, pady=5, sticky='e')
+        self.category_box = ttk.Combobox(form, state='readonly')
+        self.category_box.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+
+        ttk.Button(self.setup_frame, text="Mulai", command=self.load_questions).pack(pady=10)
+
+        self.app.worker.submit(list_categories, self.app.db,
+                               on_success=lambda categories: self.category_box.configure(values=categories),
+                               on_error=self.load_failed, db=self.app.db, owner=self.window)
+
+    def selection_options(self):
+        """Argumen pemilihan soal untuk start_session sesuai mode yang dipilih."""
+        mode = self.mode.get()
+        if mode == 'all':
+            return {}
+        try:
+            count = int(self.count_var.get())
+        except ValueError:
+            count = DEFAULT_QUIZ_SIZE
+        options = {'count': max(count, 1)}
+        if mode == 'category':
+            options['category'] = self.category_box.get()
+        elif mode == 'weighted':
+            options['weighted'] = True
+        return options
+
+    @profiled
+    def load_questions(self):
+        if self.mode.get() == 'category' and not self.category_box.get():
+            messagebox.showerror("Error", "Pilih kategori terlebih dahulu.")
+            return
+        options = self.selection_options()
+        self.setup_frame.destroy()
+
+        # Soal dibaca bertahap di latar belakang; soal pertama ditunggu di worker
+        self.app.worker.submit(self.app.engine.start_session, prefetch=True,
+                               user_id=self.app.user_id,
+                               on_success=self.session_started, on_error=self.load_failed,
+                               on_discard=lambda session: session.close(),
+                               indicator=self.indicator, owner=self.window, **options)
+
+    def session_started(self, session):
+        self.session = session
+        if session.finished:
             messagebox.showinfo("Info", "Tidak ada soal untuk dimainkan.")
             self.window.destroy()
             return
 
+        # Widget soal dibuat sekali lalu dipakai ulang untuk setiap soal
+        self.create_question_view()
+
         # Menampilkan pertanyaan
         self.display_question()
 
-    def load_questions(self):
-        with sqlite3.connect(self.app.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT question, answer, options FROM questions")
-            rows = cursor.fetchall()
-            for row in rows:
-                question, answer, options = row
-                options_list = options.split(',')
-                self.questions.append({
-                    'question': question,
-                    'answer': answer,
-                    'options': options_list
-                })
+        # Jawaban ditulis ke database secara berkala, bukan setiap kali menjawab
+        self.flush_timer = self.window.after(self.FLUSH_MS, self.flush_answers)
+
+    def flush_answers(self, finished=False):
+        """Menulis jawaban yang tertunda lewat worker, lalu menjadwalkan flush berikutnya."""
+        if not finished:
+            self.flush_timer = None
+            if self.session.finished:
+                return
+            self.flush_timer = self.window.after(self.FLUSH_MS, self.flush_answers)
+            if not self.session.recorder.pending:
+                return
+        self.app.worker.submit(self.session.recorder.flush, finished=finished,
+                               on_error=self.flush_failed, db=self.app.db)
+
+    def flush_failed(self, e):
+        # Jawaban tetap di buffer dan dicoba lagi pada flush berikutnya
+        logging.error(f"Database error saat menyimpan jawaban: {e}")
+
+    def load_failed(self, e):
+        logging.error(f"Database error saat memuat soal: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
+        self.window.destroy()
 
-    def display_question(self):
-        # Membersihkan window
-        for widget in self.window.winfo_children():
-            widget.destroy()
+    def on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        for timer in (self.flush_timer, self.next_timer):
+            if timer is not None:
+                self.window.after_cancel(timer)
+        self.flush_timer = self.next_timer = None
+        if self.session is not None:
+            self.session.close()
+            # Kuis yang ditutup sebelum selesai tetap disimpan sebagai percobaan yang belum selesai
+            if self.session.recorder.pending:
+                self.app.worker.submit(self.session.recorder.flush, on_error=self.flush_failed)
+
+    def create_question_view(self):
+        self.question_frame = ttk.Frame(self.window)
+        self.question_frame.pack(expand=True, fill='both')
+
+        self.label_title = ttk.Label(self.question_frame, font=("Arial", 14))
+        self.label_title.pack(pady=10)
+        self.label_question = ttk.Label(self.question_frame, wraplength=350, font=("Arial", 12))
+        self.label_question.pack(pady=10)
+
+        self.options_frame = ttk.Frame(self.question_frame)
+        self.options_frame.pack(fill='x')
+        self.selected_answer = tk.StringVar()
+        self.option_buttons = []
+
+        ttk.Button(self.question_frame, text="Jawab", command=self.submit_answer).pack(pady=20)
+
+    def get_option_button(self, index):
+        """Mengambil radio button ke-index dari pool, dibuat jika belum ada."""
+        while len(self.option_buttons) <= index:
+            self.option_buttons.append(ttk.Radiobutton(self.options_frame, variable=self.selected_answer))
+        return self.option_buttons[index]
 
-        question_data = self.questions[self.current_question_index]
+    def display_question(self):
+        question_data = self.session.current
         question_text = question_data['question']
         options = question_data['options']
 
         # Menampilkan pertanyaan
-        ttk.Label(self.window, text=f"Soal {self.current_question_index + 1}/{len(self.questions)}:", font=("Arial", 14)).pack(pady=10)
-        ttk.Label(self.window, text=question_text, wraplength=350, font=("Arial", 12)).pack(pady=10)
-
-
-     # Menampilkan opsi jawaban
-        self.selected_answer = tk.StringVar()
-        for option in options:
-            ttk.Radiobutton(
-                self.window,
-                text=option.strip(),
-                value=option.strip(),
-                variable=self.selected_answer
-            ).pack(anchor='w', padx=20, pady=5)
-
-        # Tombol untuk melanjutkan
-        ttk.Button(self.window, text="Jawab", command=self.submit_answer).pack(pady=20)
-
+        total = self.session.question_total()
+        if total is not None:
+            title = f"Soal {self.session.index + 1}/{total}:"
+        else:
+            title = f"Soal {self.session.index + 1}:"
+        self.label_title.configure(text=title)
+        self.label_question.configure(text=question_text)
+
+        # Menampilkan opsi jawaban
+        self.selected_answer.set('')
+        for index, (option_id, option_text) in enumerate(options):
+            button = self.get_option_button(index)
+            button.configure(text=option_text, value=str(option_id))
+            if not button.winfo_manager():
+                button.pack(anchor='w', padx=20, pady=5)
+
+        # Menyembunyikan radio button yang tidak terpakai
+        for button in self.option_buttons[len(options):]:
+            if button.winfo_manager():
+                button.pack_forget()
+
+    @profiled
     def submit_answer(self):
         selected_answer = self.selected_answer.get()
 
         if not selected_answer:
             messagebox.showerror("Error", "Pilih jawaban terlebih dahulu.")
             return
+        if not self.session.ready:
+            return
 
-        correct_answer = self.questions[self.current_question_index]['answer']
-
-        if selected_answer == correct_answer:
-            self.score += 1
+        # Soal berikutnya tidak ditunggu di thread GUI; jika belum dibaca, dicoba lagi lewat after()
+        self.session.answer(int(selected_answer), wait=False)
+        if not self.session.ready:
+            self.indicator.start()
+            self.next_timer = self.window.after(self.NEXT_POLL_MS, self.wait_next_question)
+            return
+        self.show_next_question()
 
-        self.current_question_index += 1
+    def wait_next_question(self):
+        self.next_timer = None
+        try:
+            ready = self.session.advance()
+        except Exception as e:
+            self.indicator.stop()
+            self.load_failed(e)
+            return
+        if not ready:
+            self.next_timer = self.window.after(self.NEXT_POLL_MS, self.wait_next_question)
+            return
+        self.indicator.stop()
+        self.show_next_question()
 
-        if self.current_question_index < len(self.questions):
+    def show_next_question(self):
+        if not self.session.finished:
             self.display_question()
         else:
             self.show_score()
 
     def show_score(self):
-        # Membersihkan window
-        for widget in self.window.winfo_children():
-            widget.destroy()
+        # Menyimpan sisa jawaban dan skor akhir
+        self.flush_answers(finished=True)
+        metrics.increment('quiz.completed')
+        log_event('quiz_completed', user_id=self.app.user_id, score=self.session.score,
+                  answered=self.session.index)
+
+        # Menyembunyikan tampilan soal
+        self.question_frame.pack_forget()
 
         ttk.Label(self.window, text="Kuis Selesai!", font=("Arial", 16)).pack(pady=10)
-        ttk.Label(self.window, text=f"Skor Anda: {self.score}/{len(self.questions)}", font=("Arial", 14)).pack(pady=10)
+        ttk.Label(self.window, text=f"Skor Anda: {self.session.score}/{self.session.index}", font=("Arial", 14)).pack(pady=10)
 
         ttk.Button(self.window, text="Tutup", command=self.window.destroy).pack(pady=20)
 
+class LeaderboardWindow:
+    """Papan peringkat dan tingkat kesulitan soal, dibaca dari tabel agregat per halaman."""
+    PAGE_SIZE = 50
+
+    def __init__(self, app):
+        self.app = app
+        self.users_db = app.users_db
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Papan Peringkat")
+        self.window.minsize(450, 400)
+
+        notebook = ttk.Notebook(self.window)
+        notebook.pack(expand=True, fill='both', padx=10, pady=10)
+
+        # Tab peringkat user berdasarkan skor terbaik
+        self.rank_tree, self.rank_more = self.create_tab(
+            notebook, "Peringkat", ("Peringkat", "Username", "Skor Terbaik", "Percobaan"), self.load_ranks)
+        self.rank_after = None
+
+        # Tab soal dari yang paling sering dijawab salah
+        self.stats_tree, self.stats_more = self.create_tab(
+            notebook, "Kesulitan Soal", ("ID", "Soal", "Dijawab", "Benar (%)"), self.load_stats)
+        self.stats_after = None
+
+        self.indicator = BusyIndicator(self.window)
+
+        self.load_ranks()
+        self.load_stats()
+
+    def create_tab(self, notebook, title, columns, load_more):
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column)
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+
+        button_more = ttk.Button(frame, text="Muat Lagi", command=load_more)
+        button_more.pack(side='bottom', pady=5)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(side='left', expand=True, fill='both')
+        return tree, button_more
+
+    @profiled
+    def load_ranks(self):
+        self.rank_more.state(['disabled'])
+        self.app.worker.submit(stats.fetch_leaderboard, self.app.db, self.users_db, after=self.rank_after,
+                               limit=self.PAGE_SIZE, on_success=self.append_ranks, on_error=self.load_failed,
+                               db=self.app.db, indicator=self.indicator, owner=self.window)
+
+    def append_ranks(self, rows):
+        rank = len(self.rank_tree.get_children())
+        for user_id, username, best_score, best_answered, attempts, best_at in rows:
+            rank += 1
+            self.rank_tree.insert('', 'end', values=(rank, username, f"{best_score}/{best_answered}", attempts))
+        if rows:
+            user_id, _, best_score, _, _, best_at = rows[-1]
+            self.rank_after = (best_score, best_at, user_id)
+        if len(rows) == self.PAGE_SIZE:
+            self.rank_more.state(['!disabled'])
+
+    @profiled
+    def load_stats(self):
+        self.stats_more.state(['disabled'])
+        self.app.worker.submit(stats.fetch_question_stats, self.app.db, after=self.stats_after,
+                               limit=self.PAGE_SIZE, on_success=self.append_stats, on_error=self.load_failed,
+                               db=self.app.db, indicator=self.indicator, owner=self.window)
+
+    def append_stats(self, rows):
+        for question_id, question, answered, correct, rate in rows:
+            self.stats_tree.insert('', 'end', values=(question_id, question, answered, f"{rate * 100:.0f}"))
+        if rows:
+            self.stats_after = (rows[-1][4], rows[-1][0])
+        if len(rows) == self.PAGE_SIZE:
+            self.stats_more.state(['!disabled'])
+
+    def load_failed(self, e):
+        logging.error(f"Database error saat memuat statistik: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
+
 class QuizApp:
+    """Aplikasi utama: satu jendela awal untuk login, registrasi, soal, kuis, dan peringkat.
+
+    Jendela lain dibuat saat pertama kali dibuka, dan skema kedua database
+    disiapkan sekali di thread worker setelah jendela awal tampil.
+    """
+    # Selang waktu ringkasan metrik ditulis ke log
+    METRICS_INTERVAL_MS = 60_000
+
     def __init__(self, root):
         self.root = root
-        self.root.title("Aplikasi Pengelolaan dan Pemainan Kuis")
-        self.root.minsize(400, 300)
+        self.root.title("Aplikasi Kuis")
+        self.root.minsize(300, 200)
+
+        # Style dibuat sekali dan dipakai semua jendela
+        self.style = ttk.Style(self.root)
+        self.style.theme_use('clam')
+
+        self.worker = DatabaseWorker(self.root, metrics=metrics)
+        self.users_db = Database.get(USERS_DB_PATH)
+        # Kunci akun dari users.db dimuat oleh init_db
+        self.login_limiter = LoginLimiter()
+        # Database soal (self.db) dan QuizEngine tersedia setelah init_db selesai
+        self.engine = None
+        self.db = None
+
+        # Diisi oleh LoginWindow setelah login berhasil
+        self.user_id = None
+        self.windows = {}
+        # Perawatan database di thread latar belakang, dimulai setelah init_db selesai
+        self.maintenance = None
+
+        # Membuat UI utama
+        self.create_main_ui()
+        self.indicator = BusyIndicator(self.root)
+        self.worker.submit(self.init_db, on_success=self.db_ready, on_error=self.db_failed,
+                           indicator=self.indicator)
+        self.root.after(self.METRICS_INTERVAL_MS, self.log_metrics)
+
+    def log_metrics(self):
+        metrics.log_snapshot()
+        if self.engine is not None:
+            log_event('question_cache', **self.engine.cache.stats())
+        self.root.after(self.METRICS_INTERVAL_MS, self.log_metrics)
 
-        self.DATA_FOLDER = 'database'
-        self.DB_PATH = os.path.join(self.DATA_FOLDER, 'questions.db')
+    def init_db(self):
+        """Menyiapkan skema users.db dan questions.db; dijalankan sekali di thread worker."""
+        if not os.path.exists(DATA_FOLDER):
+            os.makedirs(DATA_FOLDER)
+
+        migrate_users_db(self.users_db)
+        auth.load_lockouts(self.users_db, self.login_limiter)
+        return QuizEngine.open(QUESTIONS_DB_PATH)
+
+    def db_ready(self, engine):
+        self.engine = engine
+        self.db = engine.db
+        for button in self.db_buttons:
+            button.state(['!disabled'])
+        self.maintenance = MaintenanceScheduler([self.users_db, self.db], backup_dir=BACKUP_FOLDER).start()
+
+    def db_failed(self, e):
+        logging.error(f"Gagal menyiapkan database: {e}")
+        messagebox.showerror("Error", f"Terjadi kesalahan pada database: {e}")
+
+    def create_main_ui(self):
+        main_frame = ttk.Frame(self.root)
+        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+        label_title = ttk.Label(main_frame, text="Selamat Datang!", font=("Arial", 16))
+        label_title.pack(pady=20)
+
+        self.label_user = ttk.Label(main_frame, text="Belum login")
+        self.label_user.pack()
+
+        buttons = (("Login", self.open_login_window), ("Registrasi", self.open_register_window),
+                   ("Kelola Soal", self.open_manage_questions), ("Mulai Kuis", self.start_quiz),
+                   ("Papan Peringkat", self.open_leaderboard))
+        self.db_buttons = []
+        for text, command in buttons:
+            button = ttk.Button(main_frame, text=text, width=15, command=command)
+            button.pack(pady=5)
+            # Semua tombol membutuhkan database; aktif setelah init_db selesai
+            button.state(['disabled'])
+            self.db_buttons.append(button)
+
+    def set_user(self, user_id, username):
+        self.user_id = user_id
+        self.label_user.configure(text=f"Login sebagai: {username}")
+
+    def show_window(self, name, window_class):
+        """Membuat jendela saat pertama dibuka; jika masih terbuka, jendela itu dimunculkan lagi."""
+        toplevel = self.windows.get(name)
+        if toplevel is not None and toplevel.winfo_exists():
+            toplevel.deiconify()
+            toplevel.lift()
+            toplevel.focus_set()
+            return
+        window = window_class(self)
+        self.windows[name] = getattr(window, 'window', None) or getattr(window, f'{name}_window')
+
+    @profiled
+    def open_register_window(self):
+        self.show_window('register', RegisterWindow)
 
-        ttk.Button(self.root, text="Kelola Soal", command=self.open_manage_questions).pack(pady=20)
-        ttk.Button(self.root, text="Mulai Kuis", command=self.start_quiz).pack(pady=20)
+    @profiled
+    def open_login_window(self):
+        self.show_window('login', LoginWindow)
 
+    @profiled
     def open_manage_questions(self):
-        ManageQuestionsWindow(self)
+        self.show_window('manage', ManageQuestionsWindow)
 
+    @profiled
     def start_quiz(self):
-        PlayQuizWindow(self)
+        self.show_window('play', PlayQuizWindow)
 
+    @profiled
+    def open_leaderboard(self):
+        self.show_window('leaderboard', LeaderboardWindow)
 
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizApp(root)
-    root.mainloop()
 
+def main():
+    setup_logging()
+    try:
+        root = tk.Tk()
+        app = QuizApp(root)
+        root.mainloop()
+        if app.maintenance is not None:
+            app.maintenance.stop()
+    finally:
+        # Ringkasan terakhir ditulis sebelum antrean log dikosongkan
+        metrics.log_snapshot()
+        stop_logging()
+
+
+if __name__ == "__main__":
+    main()
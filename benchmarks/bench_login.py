@@ -0,0 +1,66 @@
+"""Benchmark kapasitas login (login per detik) untuk setiap setelan biaya hash.
+
+Contoh: ``python benchmarks/bench_login.py --logins 20 --threads 1 4``
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import Database
+from database import auth
+from database.schema import migrate_users_db
+
+
+def cost_settings():
+    if auth.HAS_SCRYPT:
+        return [{'algorithm': 'scrypt', 'n': 2 ** exp, 'r': auth.SCRYPT_R, 'p': auth.SCRYPT_P}
+                for exp in range(12, 18)]
+    return [{'algorithm': 'pbkdf2_sha256', 'iterations': iterations}
+            for iterations in (100_000, 200_000, 400_000, 800_000)]
+
+
+def describe(params):
+    if params['algorithm'] == 'scrypt':
+        return f"scrypt n=2^{params['n'].bit_length() - 1}"
+    return f"pbkdf2 it={params['iterations']}"
+
+
+def make_db(params):
+    db = Database(os.path.join(tempfile.mkdtemp(), 'users.db'))
+    migrate_users_db(db)
+    db.execute("INSERT INTO users (username, password) VALUES (?, ?)",
+               ('benchuser', auth.hash_password('rahasia123', params)))
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"Kalibrasi host ini: {describe(auth.current_params())}")
+    for params in cost_settings():
+        # Parameter kalibrasi disamakan agar login() tidak melakukan rehash
+        auth._calibrated = params
+        db = make_db(params)
+        results = []
+        for threads in args.threads:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                ok = all(pool.map(lambda _: auth.login(db, 'benchuser', 'rahasia123').ok, range(args.logins)))
+            elapsed = time.perf_counter() - start
+            assert ok
+            results.append(f"{threads} thread: {args.logins / elapsed:8.1f} login/s")
+        print(f"{describe(params):18s} " + "  ".join(results))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark waktu render per soal di PlayQuizWindow.
+
+Membandingkan cara lama (hapus semua widget lalu buat ulang) dengan
+tampilan soal yang dipakai ulang. Butuh display; di server jalankan lewat
+``xvfb-run python benchmarks/bench_render.py``.
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+from tkinter import ttk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import Database
+from database.questions import insert_question
+from database.worker import DatabaseWorker
+from quiz_engine import QuizEngine, iter_questions
+from database.schema import migrate_questions_db
+
+
+def load_gui():
+    spec = importlib.util.spec_from_file_location("project_gui", os.path.join(ROOT, "Project GUI.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_db(count):
+    path = os.path.join(tempfile.mkdtemp(), 'questions.db')
+    db = Database(path)
+    migrate_questions_db(db)
+    with db.transaction():
+        for i in range(count):
+            insert_question(db, f"Soal nomor {i}?", "A", ["A", "B", "C", "D"])
+    return db
+
+
+def legacy_display(window, question_data, index):
+    """Salinan display_question versi lama, untuk pembanding."""
+    for widget in window.winfo_children():
+        widget.destroy()
+    ttk.Label(window, text=f"Soal {index + 1}:", font=("Arial", 14)).pack(pady=10)
+    ttk.Label(window, text=question_data['question'], wraplength=350, font=("Arial", 12)).pack(pady=10)
+    selected_answer = tk.StringVar()
+    for option_id, option_text in question_data['options']:
+        ttk.Radiobutton(window, text=option_text, value=str(option_id),
+                        variable=selected_answer).pack(anchor='w', padx=20, pady=5)
+    ttk.Button(window, text="Jawab").pack(pady=20)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+def measure_render(count):
+    """Mengukur waktu render per soal; mengembalikan ringkasan untuk kedua cara."""
+    gui = load_gui()
+    root = tk.Tk()
+    root.withdraw()
+
+    class App:
+        pass
+
+    app = App()
+    app.root = root
+    app.engine = QuizEngine(make_db(count))
+    app.db = app.engine.db
+    app.worker = DatabaseWorker(root)
+    app.user_id = None
+    questions = list(iter_questions(app.db))
+
+    play = gui.PlayQuizWindow(app)
+    # Mode bawaan "Semua soal", langsung dimulai tanpa menekan tombol
+    play.load_questions()
+    while play.session is None:
+        root.update()
+
+    reused = []
+    for index, question in enumerate(questions):
+        play.session.current = question
+        play.session.index = index
+        start = time.perf_counter()
+        play.display_question()
+        root.update()
+        reused.append(time.perf_counter() - start)
+    play.window.destroy()
+
+    legacy_window = tk.Toplevel(root)
+    legacy = []
+    for index, question in enumerate(questions):
+        start = time.perf_counter()
+        legacy_display(legacy_window, question, index)
+        root.update()
+        legacy.append(time.perf_counter() - start)
+    legacy_window.destroy()
+    app.worker.shutdown()
+    root.destroy()
+    return {'destroy_recreate': summarize(legacy), 'reuse': summarize(reused)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--questions', type=int, default=500)
+    args = parser.parse_args()
+
+    for name, stats in measure_render(args.questions).items():
+        print(f"{name:17s} mean={stats['mean_ms']:.3f}ms p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
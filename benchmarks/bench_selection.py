@@ -0,0 +1,70 @@
+"""Benchmark waktu mulai kuis acak (id diundi dan dicek lewat primary key) pada bank soal besar.
+
+Contoh: ``python benchmarks/bench_selection.py --questions 1000000 --count 10``
+
+Juga memeriksa keseragaman: ``--quizzes`` kuis diundi dari bank kecil
+(``--uniformity-questions``) lalu sebaran berapa kali tiap soal terpilih
+dicetak; untuk pemilihan yang seragam semua persentil dekat nilai harapan.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from synthetic import make_question_db
+from database.selection import sample_question_ids
+from quiz_engine import QuizEngine
+
+
+def time_sessions(engine, runs, **selection):
+    """Mengembalikan (rata-rata ms, ms terlama) untuk memulai satu sesi."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        session = engine.start_session(record=False, **selection)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert session.question_total() == selection['count']
+    return sum(timings) / len(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--questions', type=int, default=1_000_000)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--uniformity-questions', type=int, default=1000)
+    parser.add_argument('--quizzes', type=int, default=20_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = make_question_db(os.path.join(tempfile.mkdtemp(), 'questions.db'), args.questions)
+    print(f"Bank {args.questions} soal dibuat dalam {time.perf_counter() - start:.1f} s")
+
+    engine = QuizEngine(db)
+    for name, selection in (('acak', {}), ('kategori', {'category': 'sains'}), ('berbobot', {'weighted': True})):
+        average, worst = time_sessions(engine, args.runs, count=args.count, **selection)
+        print(f"{name:9s} {args.count} soal: rata-rata {average:6.2f} ms, terlama {worst:6.2f} ms")
+    db.close()
+
+    total = args.uniformity_questions
+    db = make_question_db(os.path.join(tempfile.mkdtemp(), 'uniformity.db'), total)
+    # Hapus sebagian soal agar celah id ikut diuji
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM questions WHERE id % 7 = 0")
+    remaining = [row[0] for row in db.fetchall("SELECT id FROM questions")]
+    rng = random.Random(0)
+    picks = Counter()
+    for _ in range(args.quizzes):
+        picks.update(sample_question_ids(db, args.count, rng=rng))
+    counts = sorted(picks[question_id] for question_id in remaining)
+    expected = args.quizzes * args.count / len(counts)
+    print(f"keseragaman {args.quizzes} kuis dari {len(counts)} soal (harapan {expected:.0f} per soal): "
+          f"min {counts[0]}, p10 {counts[len(counts) // 10]}, median {counts[len(counts) // 2]}, "
+          f"p90 {counts[len(counts) * 9 // 10]}, max {counts[-1]}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
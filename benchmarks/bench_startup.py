@@ -0,0 +1,75 @@
+"""Benchmark waktu startup aplikasi sampai jendela pertama tampil.
+
+Setiap percobaan menjalankan proses Python baru, sehingga waktu start
+interpreter dan import modul ikut terukur. Butuh display; di server
+jalankan lewat ``xvfb-run python benchmarks/bench_startup.py``.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_child(db_dir):
+    """Dijalankan di proses anak: membuka aplikasi lalu mencetak waktu tiap tahap (time.time())."""
+    times = {'start': time.time()}
+    sys.path.insert(0, ROOT)
+    import tkinter as tk
+
+    spec = importlib.util.spec_from_file_location("project_gui", os.path.join(ROOT, "Project GUI.py"))
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+    # Database sementara agar file di folder database/ tidak tersentuh
+    gui.USERS_DB_PATH = os.path.join(db_dir, 'users.db')
+    gui.QUESTIONS_DB_PATH = os.path.join(db_dir, 'questions.db')
+    times['imported'] = time.time()
+
+    root = tk.Tk()
+    app = gui.QuizApp(root)
+    times['created'] = time.time()
+    root.wait_visibility()
+    times['first_frame'] = time.time()
+    while app.db is None:
+        root.update()
+    times['db_ready'] = time.time()
+    root.destroy()
+    print(json.dumps(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    db_dir = tempfile.mkdtemp()
+    stages = {'import': [], 'QuizApp()': [], 'jendela pertama': [], 'database siap': []}
+    for _ in range(args.runs):
+        launched = time.time()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', db_dir],
+                                check=True, capture_output=True, text=True).stdout
+        times = json.loads(output.strip().splitlines()[-1])
+        stages['import'].append(times['imported'] - launched)
+        stages['QuizApp()'].append(times['created'] - launched)
+        stages['jendela pertama'].append(times['first_frame'] - launched)
+        stages['database siap'].append(times['db_ready'] - launched)
+
+    print(f"{args.runs} kali startup (waktu sejak proses dijalankan):")
+    for name, samples in stages.items():
+        print(f"  {name:16s} median={statistics.median(samples) * 1000:7.1f} ms  "
+              f"maks={max(samples) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Rangkaian benchmark jalur utama aplikasi dengan hasil JSON.
+
+Mengukur register/login, pemuatan halaman soal di ManageQuestionsWindow
+(1k/100k/1M soal), latensi tambah/edit/hapus soal, sesi kuis headless,
+dan waktu render per soal (jika ada display). Contoh::
+
+    python benchmarks/suite.py --sizes 1000 100000 --output hasil.json
+    xvfb-run python benchmarks/suite.py --compare hasil_lama.json
+
+Database sintetis disimpan di ``--data-dir`` dan dipakai ulang pada
+pemanggilan berikutnya dengan ukuran yang sama.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from synthetic import ROOT, make_question_db, make_users_db
+from database import Database, auth
+from database import questions as question_store
+from database.cache import QuestionCache
+from database.schema import migrate_questions_db
+from quiz_engine import QuizEngine, run_sessions
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[max(int(len(samples) * 0.95) - 1, 0)] * 1000,
+        'max_ms': samples[-1] * 1000,
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def question_db(data_dir, size):
+    path = os.path.join(data_dir, f'questions_{size}.db')
+    if os.path.exists(path):
+        db = Database(path)
+        migrate_questions_db(db)
+        if db.fetchone("SELECT COUNT(*) FROM questions")[0] == size:
+            return db
+        db.close()
+        os.remove(path)
+    return make_question_db(path, size)
+
+
+def bench_auth(data_dir, registrations, logins, threads):
+    path = os.path.join(data_dir, 'users.db')
+    if os.path.exists(path):
+        os.remove(path)
+    db = make_users_db(path, 1000)
+
+    start = time.perf_counter()
+    for i in range(registrations):
+        auth.register_user(db, f"baru{i}", 'rahasia123')
+    register_seconds = time.perf_counter() - start
+
+    result = {'params': auth.current_params(), 'register_per_s': registrations / register_seconds, 'login': {}}
+    for count in threads:
+        samples = []
+
+        def one_login(i):
+            begin = time.perf_counter()
+            assert auth.login(db, f"user{i % 1000}", 'rahasia123').ok
+            samples.append(time.perf_counter() - begin)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            list(pool.map(one_login, range(logins)))
+        result['login'][str(count)] = dict(summarize(samples), login_per_s=logins / (time.perf_counter() - start))
+    db.close()
+    return result
+
+
+def bench_load_questions(db, size, repeat):
+    """Halaman pertama, halaman di tengah, dan halaman hasil pencarian seperti di ManageQuestionsWindow."""
+    return {
+        'first_page': timed(lambda: question_store.fetch_question_rows(db, limit=100), repeat),
+        'middle_page': timed(lambda: question_store.fetch_question_rows(db, after_id=size // 2, limit=100), repeat),
+        'search_page': timed(lambda: question_store.fetch_question_rows(db, limit=100, search='sains'), repeat),
+    }
+
+
+def bench_crud(db, repeat):
+    ids = []
+    add = timed(lambda: ids.append(
+        question_store.insert_question(db, "Soal benchmark?", "A", ["A", "B", "C"], 'sains')), repeat)
+    pending = list(ids)
+    edit = timed(lambda: question_store.update_question(
+        db, pending.pop(), "Soal benchmark diubah?", "B", ["A", "B", "C"], 'sains'), repeat)
+    pending = list(ids)
+    delete = timed(lambda: question_store.delete_question(db, pending.pop()), repeat)
+    return {'add': add, 'edit': edit, 'delete': delete}
+
+
+def bench_quiz(db, sessions, repeat):
+    engine = QuizEngine(db)
+    cached_engine = QuizEngine(db, cache=QuestionCache(db))
+    answers, seconds = run_sessions(engine, sessions, record=True, count=10)
+    return {
+        'start_random_10': timed(lambda: engine.start_session(record=False, count=10), repeat),
+        'start_random_10_cached': timed(lambda: cached_engine.start_session(record=False, count=10), repeat),
+        'start_all_cached': timed(lambda: cached_engine.start_session(record=False), repeat),
+        'answers_per_s': answers / seconds,
+    }
+
+
+def bench_render(count):
+    try:
+        import tkinter
+        from bench_render import measure_render
+    except ImportError as e:
+        return {'skipped': str(e)}
+    try:
+        return measure_render(count)
+    except tkinter.TclError as e:
+        return {'skipped': f"{e} (jalankan lewat xvfb-run untuk mengukur render)"}
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'args': vars(args),
+    }
+
+
+def flatten(results, prefix=''):
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and (key.endswith('_ms') or key.endswith('_per_s')):
+            yield name, value
+
+
+def compare(baseline, current, threshold):
+    """Mencetak metrik yang berubah lebih dari ``threshold``; mengembalikan jumlah regresi."""
+    before = dict(flatten(baseline['results']))
+    regressions = 0
+    for name, value in flatten(current['results']):
+        old = before.get(name)
+        if not old:
+            continue
+        # Untuk *_ms lebih kecil lebih baik, untuk *_per_s lebih besar lebih baik
+        change = value / old - 1 if name.endswith('_ms') else old / value - 1
+        if abs(change) >= threshold:
+            worse = change > 0
+            regressions += worse
+            print(f"{'REGRESI' if worse else 'lebih cepat':11s} {name}: {old:.3f} -> {value:.3f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--registrations', type=int, default=5)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--render-questions', type=int, default=200)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'quiz_bench'))
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="file JSON hasil sebelumnya sebagai pembanding")
+    parser.add_argument('--threshold', type=float, default=0.1, help="batas perubahan yang dilaporkan (0.1 = 10%%)")
+    args = parser.parse_args()
+    args.threads = sorted(set(args.threads))
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    results = {'load_questions': {}, 'crud': {}, 'quiz': {}}
+    print("auth ...", flush=True)
+    results['auth'] = bench_auth(args.data_dir, args.registrations, args.logins, args.threads)
+    for size in args.sizes:
+        print(f"{size} soal ...", flush=True)
+        db = question_db(args.data_dir, size)
+        results['load_questions'][str(size)] = bench_load_questions(db, size, args.repeat)
+        results['crud'][str(size)] = bench_crud(db, args.repeat)
+        results['quiz'][str(size)] = bench_quiz(db, args.sessions, args.repeat)
+        db.close()
+    print("render ...", flush=True)
+    results['render'] = bench_render(args.render_questions)
+
+    report = {'meta': metadata(args), 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Hasil ditulis ke {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            regressions = compare(json.load(handle), report, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Pembuat database sintetis untuk benchmark."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import Database
+from database import auth
+from database.schema import migrate_questions_db, migrate_users_db
+from database.transfer import insert_batch
+
+CATEGORIES = ['matematika', 'sains', 'sejarah', 'bahasa', None]
+
+
+def question_records(start, stop):
+    return [(f"Soal nomor {i} tentang {CATEGORIES[i % 4]}?", "A", ["A", "B", "C", "D"],
+             CATEGORIES[i % len(CATEGORIES)])
+            for i in range(start, stop)]
+
+
+def make_question_db(path, count, batch_size=10_000):
+    """Database soal berisi ``count`` soal, disisipkan per batch seperti impor massal."""
+    db = Database(path)
+    migrate_questions_db(db)
+    for start in range(0, count, batch_size):
+        with db.transaction() as conn:
+            insert_batch(conn, question_records(start, min(start + batch_size, count)))
+    return db
+
+
+def make_users_db(path, count, password='rahasia123', params=None):
+    """Database users berisi ``count`` user dengan password yang sama.
+
+    Hash dibuat sekali lalu dipakai ulang agar pembuatan database tidak
+    didominasi biaya KDF.
+    """
+    db = Database(path)
+    migrate_users_db(db)
+    stored = auth.hash_password(password, params)
+    db.executemany("INSERT INTO users (username, password) VALUES (?, ?)",
+                   ((f"user{i}", stored) for i in range(count)))
+    return db
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Lokasi file database, sama untuk GUI maupun driver headless
+DATA_FOLDER = os.path.dirname(os.path.abspath(__file__))
+USERS_DB_PATH = os.path.join(DATA_FOLDER, 'users.db')
+QUESTIONS_DB_PATH = os.path.join(DATA_FOLDER, 'questions.db')
+
+
+class Database:
+    """Lapisan akses SQLite bersama untuk satu file database.
+
+    Setiap thread memakai satu koneksi yang berumur panjang (disimpan di
+    thread-local), sehingga tombol di GUI tidak lagi membuka dan menutup
+    koneksi baru setiap kali diklik. Koneksi memakai mode WAL dan cache
+    statement bawaan sqlite3 supaya query yang sama tidak di-parse ulang.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path, cached_statements=128, timeout=5.0):
+        self.path = path
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path):
+        """Mengembalikan instance Database yang sama untuk path yang sama."""
+        with cls._instances_lock:
+            db = cls._instances.get(path)
+            if db is None:
+                db = cls(path)
+                cls._instances[path] = db
+            return db
+
+    def connection(self):
+        """Mengembalikan koneksi milik thread saat ini, dibuat jika belum ada."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transaksi diatur sendiri lewat transaction()
+            conn = sqlite3.connect(self.path, timeout=self.timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Menjalankan blok di dalam satu transaksi eksplisit.
+
+        Transaksi bersarang digabung ke transaksi terluar.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            # SQLite bisa sudah membatalkan transaksi sendiri (interrupt, disk penuh); error aslinya yang diteruskan
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def execute(self, sql, params=()):
+        """Menjalankan satu perintah tulis di dalam transaksi, mengembalikan cursor."""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        return self.connection().executescript(script)
+
+    def query(self, sql, params=()):
+        """Menjalankan SELECT dan mengembalikan cursor (belum di-fetch)."""
+        return self.connection().execute(sql, params)
+
+    def fetchone(self, sql, params=()):
+        return self.query(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        return self.query(sql, params).fetchall()
+
+    def release(self):
+        """Menutup koneksi milik thread saat ini; dipanggil thread berumur pendek sebelum selesai."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close(self):
+        """Menutup semua koneksi yang pernah dibuka oleh instance ini."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
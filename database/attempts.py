@@ -0,0 +1,80 @@
+"""Penyimpanan percobaan kuis dan jawabannya dengan penulisan tertunda (write-behind)."""
+import threading
+import time
+
+from database.stats import record_answers, record_finished_attempt
+
+
+def _now():
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class AttemptRecorder:
+    """Menampung jawaban satu percobaan kuis di memori lalu menulisnya sekaligus.
+
+    ``record`` hanya menambah ke buffer, sehingga menjawab soal tidak
+    menyentuh disk. ``flush`` menulis semua jawaban yang tertunda dalam satu
+    transaksi dan boleh dipanggil dari thread worker (misalnya oleh timer).
+    Statistik soal dan skor terbaik user ikut diperbarui di transaksi itu.
+    """
+
+    def __init__(self, db, user_id=None):
+        self.db = db
+        self.user_id = user_id
+        self.attempt_id = None
+        self.started_at = _now()
+        self.score = 0
+        self.answered = 0
+        self.finished = False
+        self._buffer = []
+        self._lock = threading.Lock()
+        # Hanya satu flush yang boleh menulis pada satu waktu
+        self._flush_lock = threading.Lock()
+
+    def record(self, question_id, option_id, is_correct):
+        with self._lock:
+            self._buffer.append((question_id, option_id, int(is_correct), _now()))
+            self.answered += 1
+            if is_correct:
+                self.score += 1
+
+    @property
+    def pending(self):
+        return len(self._buffer)
+
+    def flush(self, finished=False):
+        """Menulis jawaban tertunda (dan status akhir percobaan) dalam satu transaksi."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                score, answered = self.score, self.answered
+            if not rows and not finished and self.attempt_id is not None:
+                return self.attempt_id
+            attempt_id = self.attempt_id
+            finished_at = _now() if finished and not self.finished else None
+            try:
+                with self.db.transaction() as conn:
+                    if attempt_id is None:
+                        attempt_id = conn.execute(
+                            "INSERT INTO attempts (user_id, started_at) VALUES (?, ?)",
+                            (self.user_id, self.started_at)).lastrowid
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO attempt_answers "
+                        "(attempt_id, question_id, option_id, is_correct, answered_at) VALUES (?, ?, ?, ?, ?)",
+                        [(attempt_id, *row) for row in rows])
+                    record_answers(conn, rows)
+                    conn.execute(
+                        "UPDATE attempts SET score = ?, answered = ?, finished_at = COALESCE(finished_at, ?) "
+                        "WHERE id = ?",
+                        (score, answered, finished_at, attempt_id))
+                    if finished_at is not None:
+                        record_finished_attempt(conn, self.user_id, score, answered, finished_at)
+            except Exception:
+                # Jawaban dikembalikan ke buffer agar bisa dicoba lagi pada flush berikutnya
+                with self._lock:
+                    self._buffer[:0] = rows
+                raise
+            self.attempt_id = attempt_id
+            if finished:
+                self.finished = True
+            return attempt_id
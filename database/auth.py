@@ -0,0 +1,244 @@
+"""Hash password bergaram dengan biaya yang dikalibrasi otomatis.
+
+Format yang disimpan di kolom ``users.password``::
+
+    scrypt$<n>$<r>$<p>$<salt hex>$<hash hex>
+    pbkdf2_sha256$<iterasi>$<salt hex>$<hash hex>
+
+Parameter biaya disimpan per user di dalam string tersebut, sehingga hash
+lama (termasuk SHA-256 tanpa garam dari versi sebelumnya) tetap bisa
+diverifikasi lalu di-hash ulang saat user berhasil login.
+"""
+import hashlib
+import hmac
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_TARGET_SECONDS = 0.1
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_MIN_N = 2 ** 12
+SCRYPT_MAX_N = 2 ** 20
+PBKDF2_MIN_ITERATIONS = 100_000
+PBKDF2_MAX_ITERATIONS = 5_000_000
+
+HAS_SCRYPT = hasattr(hashlib, 'scrypt')
+
+# Akun dikunci selama LOCKOUT_SECONDS setelah MAX_FAILED_LOGINS password salah berturut-turut
+MAX_FAILED_LOGINS = 5
+LOCKOUT_SECONDS = 300
+
+# Hasil login yang cukup ditampilkan sekali oleh GUI
+LoginResult = namedtuple('LoginResult', ['ok', 'user_id', 'message'])
+
+_calibrated = None
+_calibrate_lock = threading.Lock()
+_dummy_hash = None
+
+
+def _scrypt(password, salt, n, r, p):
+    # maxmem harus cukup untuk 128 * r * n byte
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * r * n + 1024 * 1024, dklen=HASH_BYTES)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations, dklen=HASH_BYTES)
+
+
+def _time_once(params):
+    salt = os.urandom(SALT_BYTES)
+    start = time.perf_counter()
+    if params['algorithm'] == 'scrypt':
+        _scrypt('kalibrasi', salt, params['n'], params['r'], params['p'])
+    else:
+        _pbkdf2('kalibrasi', salt, params['iterations'])
+    return time.perf_counter() - start
+
+
+def calibrate(target_seconds=DEFAULT_TARGET_SECONDS):
+    """Mencari parameter biaya terbesar yang waktu verifikasinya <= target di host ini."""
+    if HAS_SCRYPT:
+        params = {'algorithm': 'scrypt', 'n': SCRYPT_MIN_N, 'r': SCRYPT_R, 'p': SCRYPT_P}
+        # Waktu scrypt kira-kira linear terhadap n, jadi n dinaikkan kelipatan 2
+        while params['n'] < SCRYPT_MAX_N:
+            if _time_once(params) * 2 > target_seconds:
+                break
+            params['n'] *= 2
+        return params
+
+    params = {'algorithm': 'pbkdf2_sha256', 'iterations': PBKDF2_MIN_ITERATIONS}
+    elapsed = _time_once(params)
+    iterations = int(PBKDF2_MIN_ITERATIONS * target_seconds / max(elapsed, 1e-6))
+    params['iterations'] = max(PBKDF2_MIN_ITERATIONS, min(iterations, PBKDF2_MAX_ITERATIONS))
+    return params
+
+
+def current_params():
+    """Parameter hasil kalibrasi, dihitung sekali per proses."""
+    global _calibrated
+    with _calibrate_lock:
+        if _calibrated is None:
+            _calibrated = calibrate()
+        return dict(_calibrated)
+
+
+def hash_password(password, params=None):
+    params = params or current_params()
+    salt = os.urandom(SALT_BYTES)
+    if params['algorithm'] == 'scrypt':
+        digest = _scrypt(password, salt, params['n'], params['r'], params['p'])
+        return f"scrypt${params['n']}${params['r']}${params['p']}${salt.hex()}${digest.hex()}"
+    digest = _pbkdf2(password, salt, params['iterations'])
+    return f"pbkdf2_sha256${params['iterations']}${salt.hex()}${digest.hex()}"
+
+
+def parse_hash(stored):
+    """Mengurai string hash menjadi (params, salt, digest)."""
+    parts = stored.split('$')
+    if parts[0] == 'scrypt' and len(parts) == 6:
+        params = {'algorithm': 'scrypt', 'n': int(parts[1]), 'r': int(parts[2]), 'p': int(parts[3])}
+        return params, bytes.fromhex(parts[4]), bytes.fromhex(parts[5])
+    if parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+        params = {'algorithm': 'pbkdf2_sha256', 'iterations': int(parts[1])}
+        return params, bytes.fromhex(parts[2]), bytes.fromhex(parts[3])
+    # Hash SHA-256 tanpa garam dari versi lama
+    return {'algorithm': 'sha256'}, b'', bytes.fromhex(stored)
+
+
+def verify_password(password, stored):
+    try:
+        params, salt, digest = parse_hash(stored)
+    except ValueError:
+        return False
+    if params['algorithm'] == 'scrypt':
+        candidate = _scrypt(password, salt, params['n'], params['r'], params['p'])
+    elif params['algorithm'] == 'pbkdf2_sha256':
+        candidate = _pbkdf2(password, salt, params['iterations'])
+    else:
+        candidate = hashlib.sha256(password.encode()).digest()
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(stored, params=None):
+    """True jika hash memakai algoritma lama atau biaya lebih rendah dari kalibrasi."""
+    params = params or current_params()
+    try:
+        stored_params = parse_hash(stored)[0]
+    except ValueError:
+        return True
+    if stored_params['algorithm'] != params['algorithm']:
+        return True
+    if params['algorithm'] == 'scrypt':
+        return stored_params['n'] < params['n']
+    return stored_params['iterations'] < params['iterations']
+
+
+def _dummy_password_hash():
+    """Hash acak dengan parameter terkini, untuk verifikasi palsu saat username tidak ada."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(os.urandom(SALT_BYTES).hex())
+    return _dummy_hash
+
+
+def register_user(db, username, password):
+    """Meng-hash password lalu menyimpan user baru. Dijalankan di thread worker."""
+    db.execute('INSERT INTO users (username, password) VALUES (?, ?)', (username, hash_password(password)))
+
+
+def check_login_input(username, password, limiter=None):
+    """Validasi input login tanpa I/O; mengembalikan LoginResult gagal atau None.
+
+    Jika ``limiter`` (LoginLimiter) diberikan, percobaan yang melewati batas
+    laju atau milik akun terkunci juga ditolak di sini.
+    """
+    if not username or not password:
+        return LoginResult(False, None, "Semua field harus diisi.")
+    if limiter is not None:
+        wait = limiter.check(username)
+        if wait > 0:
+            return _limited_result(wait)
+    return None
+
+
+def _limited_result(wait):
+    return LoginResult(False, None, f"Terlalu banyak percobaan login. Coba lagi dalam {math.ceil(wait)} detik.")
+
+
+def load_lockouts(db, limiter):
+    """Menyalin kunci akun yang masih berlaku dari users.db ke ``limiter``."""
+    rows = db.fetchall("""
+        SELECT users.username, login_lockouts.locked_until
+        FROM login_lockouts JOIN users ON users.id = login_lockouts.user_id
+        WHERE login_lockouts.locked_until > ?
+    """, (time.time(),))
+    for username, locked_until in rows:
+        limiter.lock(username, locked_until)
+    return len(rows)
+
+
+def _record_failure(db, user_id):
+    """Menambah hitungan gagal; mengembalikan waktu kunci berakhir jika akun baru saja dikunci."""
+    locked_until = time.time() + LOCKOUT_SECONDS
+    # Saat batas tercapai hitungan direset, sehingga setelah kunci berakhir tersedia MAX_FAILED_LOGINS percobaan lagi
+    with db.transaction() as conn:
+        rows = conn.execute("""
+            INSERT INTO login_lockouts (user_id, failures, locked_until) VALUES (?, 1, NULL)
+            ON CONFLICT (user_id) DO UPDATE SET
+                locked_until = CASE WHEN failures + 1 >= ? THEN ? ELSE locked_until END,
+                failures = CASE WHEN failures + 1 >= ? THEN 0 ELSE failures + 1 END
+            RETURNING locked_until
+        """, (user_id, MAX_FAILED_LOGINS, locked_until, MAX_FAILED_LOGINS)).fetchall()
+    return locked_until if rows[0][0] == locked_until else None
+
+
+def login(db, username, password, limiter=None, checked=False):
+    """Memeriksa username/password dengan satu lookup di indeks users(username, password).
+
+    Status kunci akun dibaca dalam query yang sama; akun terkunci ditolak
+    sebelum hashing. Hash lama di-hash ulang jika login berhasil.
+    ``checked=True`` berarti pemanggil sudah memanggil ``check_login_input``
+    dengan ``limiter`` yang sama, sehingga token bucket tidak dipotong dua kali.
+    """
+    invalid = check_login_input(username, password, None if checked else limiter)
+    if invalid is not None:
+        return invalid
+    # INDEXED BY: tanpa ini planner memilih indeks UNIQUE(username) yang tidak covering
+    row = db.fetchone("""
+        SELECT users.id, users.password, login_lockouts.failures, login_lockouts.locked_until
+        FROM users INDEXED BY idx_users_login
+        LEFT JOIN login_lockouts ON login_lockouts.user_id = users.id
+        WHERE users.username = ?
+    """, (username,))
+    if row is None:
+        # Username tidak dikenal tetap menjalankan hash agar lama respons tidak membocorkan user yang ada
+        verify_password(password, _dummy_password_hash())
+        return LoginResult(False, None, "Username atau password salah.")
+    user_id, stored, failures, locked_until = row
+    if locked_until is not None and locked_until > time.time():
+        # Dikunci oleh proses lain; disalin ke memori agar percobaan berikutnya ditolak lebih awal
+        if limiter is not None:
+            limiter.lock(username, locked_until)
+        return _limited_result(locked_until - time.time())
+
+    if not verify_password(password, stored):
+        locked_until = _record_failure(db, user_id)
+        if locked_until is not None:
+            if limiter is not None:
+                limiter.lock(username, locked_until)
+            return _limited_result(LOCKOUT_SECONDS)
+        return LoginResult(False, None, "Username atau password salah.")
+    if failures is not None:
+        db.execute('DELETE FROM login_lockouts WHERE user_id = ?', (user_id,))
+        if limiter is not None:
+            limiter.unlock(username)
+    if needs_rehash(stored):
+        db.execute('UPDATE users SET password = ? WHERE id = ?', (hash_password(password), user_id))
+    return LoginResult(True, user_id, "Login berhasil!")
@@ -0,0 +1,142 @@
+"""Cache soal di memori untuk seluruh proses, dengan batas memori dan eviksi LRU.
+
+Isi cache dianggap berlaku selama nilai di tabel ``bank_version`` belum
+berubah. Setiap tambah/edit/hapus/impor soal menaikkan nilai tersebut
+(``bump_bank_version``), sehingga pembacaan berikutnya membuang seluruh
+cache, juga jika perubahan dilakukan oleh proses lain.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from database.questions import load_questions_by_ids
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def approximate_size(value):
+    """Perkiraan ukuran objek (beserta isinya) dalam byte."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """Cache kunci -> nilai dengan batas total ukuran; entri terlama dibuang lebih dulu."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size=None):
+        size = approximate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class QuestionCache:
+    """Cache soal dan halaman hasil query untuk satu database soal.
+
+    ``questions(ids)`` mengembalikan soal lengkap (seperti
+    load_questions_by_ids) dan ``cached(key, loader)`` menyimpan hasil
+    query lain, misalnya satu halaman tabel atau satu batch soal.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db, max_bytes=DEFAULT_MAX_BYTES):
+        self.db = db
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, db):
+        """Mengembalikan cache yang sama untuk file database yang sama."""
+        with cls._instances_lock:
+            cache = cls._instances.get(db.path)
+            if cache is None:
+                cache = cls(db)
+                cls._instances[db.path] = cache
+            return cache
+
+    def check_version(self):
+        """Membuang cache jika bank soal sudah berubah. Dipanggil sebelum membaca database."""
+        version = self.db.fetchone("SELECT version FROM bank_version")[0]
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def cached(self, key, loader):
+        """Mengembalikan nilai untuk ``key``; jika belum ada, ``loader()`` dipanggil dan hasilnya disimpan."""
+        self.check_version()
+        with self._lock:
+            value = self._entries.get(key, self)
+            if value is not self:
+                self.hits += 1
+                return value
+            self.misses += 1
+            version = self.version
+        # Query dijalankan di luar lock agar thread lain tidak ikut menunggu
+        value = loader()
+        with self._lock:
+            if self.version == version:
+                self._entries.put(key, value)
+        return value
+
+    def questions(self, question_ids):
+        """Soal untuk daftar id sesuai urutannya; hanya soal yang belum ada di cache yang dibaca."""
+        self.check_version()
+        found = {}
+        with self._lock:
+            for question_id in question_ids:
+                question = self._entries.get(('question', question_id))
+                if question is not None:
+                    found[question_id] = question
+            self.hits += len(found)
+            self.misses += len(question_ids) - len(found)
+            version = self.version
+        missing = [question_id for question_id in question_ids if question_id not in found]
+        if missing:
+            loaded = load_questions_by_ids(self.db, missing)
+            with self._lock:
+                for question in loaded:
+                    found[question['id']] = question
+                    if self.version == version:
+                        self._entries.put(('question', question['id']), question)
+        return [found[question_id] for question_id in question_ids if question_id in found]
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._entries.total_bytes,
+                    'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,222 @@
+"""Perawatan database: backup online, statistik planner, vacuum bertahap, dan cek integritas.
+
+Semua tugas memakai koneksi milik thread pemanggil (lihat ``Database``),
+dan dengan mode WAL pembaca tidak menghalangi penulis, sehingga tugas bisa
+berjalan di thread latar belakang saat aplikasi dipakai. Backup memakai
+API backup sqlite3 dalam satu transaksi baca, ANALYZE dibatasi lewat
+``analysis_limit``, dan vacuum dilakukan dalam potongan kecil yang
+masing-masing satu transaksi singkat.
+
+Dapat dijalankan langsung::
+
+    python -m database.maintenance --all database/users.db database/questions.db
+    python -m database.maintenance --backup backups/ --check database/questions.db
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from database import DATA_FOLDER, Database
+from telemetry import log_event, metrics
+
+BACKUP_FOLDER = os.path.join(DATA_FOLDER, 'backups')
+BACKUP_KEEP = 3
+VACUUM_STEP_PAGES = 256
+# Jumlah baris per indeks yang diperiksa ANALYZE; cukup untuk statistik planner pada tabel besar
+ANALYSIS_LIMIT = 1000
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Selang waktu (detik) tiap tugas untuk MaintenanceScheduler
+DEFAULT_INTERVALS = {
+    'optimize': 60 * 60,
+    'vacuum': 60 * 60,
+    'check': 24 * 60 * 60,
+    'backup': 24 * 60 * 60,
+}
+
+
+def backup(db, backup_dir, keep=BACKUP_KEEP):
+    """Menyalin database ke ``backup_dir`` saat sedang dipakai; backup terlama dibuang.
+
+    Seluruh halaman disalin dalam satu langkah. Backup bertahap akan diulang
+    dari awal setiap kali koneksi lain menulis, sedangkan satu transaksi baca
+    di mode WAL tidak menghalangi penulis. Mengembalikan path file backup.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(db.path))[0]
+    target = os.path.join(backup_dir, f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}.db")
+    partial = target + '.tmp'
+    dest = sqlite3.connect(partial)
+    try:
+        db.connection().backup(dest)
+    finally:
+        dest.close()
+    # Nama akhir baru dipakai setelah salinan lengkap
+    os.replace(partial, target)
+
+    old = sorted(name for name in os.listdir(backup_dir)
+                 if name.startswith(stem + '-') and name.endswith('.db'))
+    for name in old[:-keep] if keep else []:
+        os.remove(os.path.join(backup_dir, name))
+    return target
+
+
+def optimize(db):
+    """Memperbarui statistik planner: ANALYZE penuh jika belum pernah, selain itu PRAGMA optimize."""
+    db.fetchall(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    has_stats = db.fetchone("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if has_stats is None:
+        db.execute("ANALYZE")
+        return 'analyze'
+    db.fetchall("PRAGMA optimize")
+    return 'optimize'
+
+
+def incremental_vacuum(db, step_pages=VACUUM_STEP_PAGES):
+    """Mengembalikan halaman kosong (mis. sisa delete_question) ke sistem file.
+
+    Membutuhkan ``auto_vacuum=INCREMENTAL``. Database yang belum memakainya
+    dilewati dengan peringatan di log: mengubahnya butuh VACUUM penuh yang
+    mengunci penulisan, sehingga hanya dilakukan lewat
+    ``--enable-incremental-vacuum``. Mengembalikan jumlah halaman yang dibebaskan.
+    """
+    if db.fetchone("PRAGMA auto_vacuum")[0] != AUTO_VACUUM_INCREMENTAL:
+        log_event('maintenance.vacuum_skipped', logging.WARNING, path=db.path,
+                  hint="jalankan python -m database.maintenance --enable-incremental-vacuum")
+        return 0
+
+    start = free = db.fetchone("PRAGMA freelist_count")[0]
+    while free:
+        # executescript menjalankan pragma sampai selesai; execute() hanya membebaskan satu halaman
+        db.executescript(f"PRAGMA incremental_vacuum({step_pages})")
+        remaining = db.fetchone("PRAGMA freelist_count")[0]
+        if remaining >= free:
+            break
+        free = remaining
+    return start - free
+
+
+def enable_incremental_vacuum(db):
+    """Mengaktifkan auto_vacuum=INCREMENTAL; butuh VACUUM penuh yang mengunci database sementara."""
+    conn = db.connection()
+    conn.execute(f"PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}")
+    conn.execute("VACUUM")
+
+
+def integrity_check(db):
+    """Menjalankan PRAGMA integrity_check; mengembalikan daftar masalah (kosong jika sehat)."""
+    rows = [row[0] for row in db.fetchall("PRAGMA integrity_check")]
+    return [] if rows == ['ok'] else rows
+
+
+def run_task(db, task, backup_dir=None):
+    """Menjalankan satu tugas, mencatat lamanya ke log dan ``metrics``; mengembalikan (hasil, ms)."""
+    start = time.perf_counter()
+    try:
+        if task == 'backup':
+            result = backup(db, backup_dir)
+        elif task == 'optimize':
+            result = optimize(db)
+        elif task == 'vacuum':
+            result = incremental_vacuum(db)
+        elif task == 'check':
+            result = integrity_check(db)
+        else:
+            raise ValueError(f"Tugas perawatan tidak dikenal: {task}")
+    except (sqlite3.Error, OSError) as e:
+        metrics.increment(f'maintenance.{task}.error')
+        log_event('maintenance', logging.ERROR, task=task, path=db.path, error=str(e))
+        raise
+    elapsed = (time.perf_counter() - start) * 1000
+    metrics.observe(f'maintenance.{task}', elapsed)
+    level = logging.ERROR if task == 'check' and result else logging.INFO
+    log_event('maintenance', level, task=task, path=db.path, ms=round(elapsed, 3), result=result)
+    return result, elapsed
+
+
+class MaintenanceScheduler:
+    """Thread latar belakang yang menjalankan tugas perawatan tiap database sesuai jadwal.
+
+    Setiap tugas pertama kali dijalankan ``initial_delay`` detik setelah
+    ``start``, lalu setiap ``intervals[tugas]`` detik. Tugas ``backup``
+    hanya dijadwalkan jika ``backup_dir`` diberikan.
+    """
+
+    def __init__(self, databases, backup_dir=None, intervals=None, initial_delay=60.0):
+        self.databases = list(databases)
+        self.backup_dir = backup_dir
+        self.intervals = dict(DEFAULT_INTERVALS if intervals is None else intervals)
+        if backup_dir is None:
+            self.intervals.pop('backup', None)
+        self.initial_delay = initial_delay
+        # (path database, tugas) -> (hasil, ms) terakhir
+        self.last_results = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='maintenance', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Meminta thread berhenti; tugas yang sedang berjalan diselesaikan dulu."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        now = time.monotonic()
+        due = {task: now + self.initial_delay for task in self.intervals}
+        while due and not self._stop.wait(max(0.0, min(due.values()) - time.monotonic())):
+            for task, when in sorted(due.items(), key=lambda item: item[1]):
+                if self._stop.is_set() or when > time.monotonic():
+                    continue
+                for db in self.databases:
+                    try:
+                        self.last_results[(db.path, task)] = run_task(db, task, self.backup_dir)
+                    except (sqlite3.Error, OSError):
+                        pass  # sudah dicatat oleh run_task; dicoba lagi pada jadwal berikutnya
+                due[task] = time.monotonic() + self.intervals[task]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', metavar='DB')
+    parser.add_argument('--backup', metavar='DIR', help="salin database ke folder ini")
+    parser.add_argument('--optimize', action='store_true', help="ANALYZE / PRAGMA optimize")
+    parser.add_argument('--vacuum', action='store_true', help="incremental vacuum")
+    parser.add_argument('--check', action='store_true', help="PRAGMA integrity_check")
+    parser.add_argument('--all', action='store_true', help="optimize, vacuum, dan check")
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help="ubah ke auto_vacuum=INCREMENTAL (VACUUM penuh, database terkunci sementara)")
+    args = parser.parse_args(argv)
+
+    tasks = ['backup'] if args.backup else []
+    tasks += [task for task in ('optimize', 'vacuum', 'check') if args.all or getattr(args, task)]
+    if not tasks and not args.enable_incremental_vacuum:
+        parser.error("pilih minimal satu tugas")
+
+    failed = False
+    for path in args.paths:
+        db = Database(path)
+        if args.enable_incremental_vacuum:
+            start = time.perf_counter()
+            enable_incremental_vacuum(db)
+            print(f"{path}: auto_vacuum=INCREMENTAL ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        for task in tasks:
+            result, elapsed = run_task(db, task, args.backup)
+            failed |= task == 'check' and bool(result)
+            print(f"{path}: {task} {elapsed:.1f} ms -> {result if result != [] else 'ok'}")
+        db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
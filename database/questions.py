@@ -0,0 +1,282 @@
+import queue
+import threading
+
+from database.schema import bump_bank_version
+
+# Baris untuk tabel di ManageQuestionsWindow: (id, soal, jawaban, opsi)
+QUESTION_ROW_SQL = """
+    SELECT q.id, q.question,
+           (SELECT text FROM options WHERE question_id = q.id AND is_correct),
+           (SELECT group_concat(text, ' | ') FROM
+               (SELECT text FROM options WHERE question_id = q.id ORDER BY ordinal))
+    FROM questions q
+"""
+
+
+# id soal yang cocok dengan satu kata pencarian di teks soal atau salah satu opsinya
+SEARCH_TERM_SQL = """
+    SELECT rowid FROM questions_fts WHERE questions_fts MATCH ?
+    UNION
+    SELECT o.question_id FROM options_fts JOIN options o ON o.id = options_fts.rowid
+    WHERE options_fts MATCH ?
+"""
+
+
+def build_match_terms(text):
+    """Mengubah teks bebas menjadi kata-kata query FTS5 yang dicari sebagai prefiks."""
+    return ['"' + word.replace('"', '""') + '"*' for word in text.split()]
+
+
+def fetch_question_rows(db, after_id=None, before_id=None, limit=100, search=None):
+    """Mengambil satu halaman baris soal dengan keyset pagination pada id.
+
+    Jika ``search`` diisi, hanya soal yang cocok dengan pencarian teks penuh
+    yang diambil.
+    """
+    conditions = []
+    params = []
+    terms = build_match_terms(search or '')
+    if terms:
+        # Setiap kata harus cocok, boleh di soal maupun di opsi yang berbeda
+        conditions.append("q.id IN (" + " INTERSECT ".join([SEARCH_TERM_SQL] * len(terms)) + ")")
+        for term in terms:
+            params.extend((term, term))
+    if before_id is not None:
+        conditions.append("q.id < ?")
+        params.append(before_id)
+    elif after_id is not None:
+        conditions.append("q.id > ?")
+        params.append(after_id)
+
+    sql = QUESTION_ROW_SQL
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    params.append(limit)
+    if before_id is not None:
+        rows = db.fetchall(sql + " ORDER BY q.id DESC LIMIT ?", params)
+        rows.reverse()
+        return rows
+    return db.fetchall(sql + " ORDER BY q.id LIMIT ?", params)
+
+
+def get_question_row(db, question_id):
+    return db.fetchone(QUESTION_ROW_SQL + " WHERE q.id = ?", (question_id,))
+
+
+def load_options(db, question_id):
+    """Mengembalikan daftar (id, teks, is_correct) opsi sebuah soal sesuai urutan."""
+    return db.fetchall(
+        "SELECT id, text, is_correct FROM options WHERE question_id = ? ORDER BY ordinal",
+        (question_id,))
+
+
+def _insert_options(conn, question_id, options, answer):
+    conn.executemany(
+        "INSERT INTO options (question_id, ordinal, text, is_correct) VALUES (?, ?, ?, ?)",
+        ((question_id, ordinal, text, int(text == answer)) for ordinal, text in enumerate(options)))
+
+
+def load_question_details(db, question_id):
+    """Mengembalikan (kategori, opsi) sebuah soal untuk form edit."""
+    row = db.fetchone("SELECT category FROM questions WHERE id = ?", (question_id,))
+    return (row[0] if row else None), load_options(db, question_id)
+
+
+def insert_question(db, question, answer, options, category=None):
+    """Menyimpan soal baru beserta opsinya, mengembalikan id soal."""
+    with db.transaction() as conn:
+        question_id = conn.execute(
+            "INSERT INTO questions (question, category) VALUES (?, ?)",
+            (question, category or None)).lastrowid
+        _insert_options(conn, question_id, options, answer)
+        bump_bank_version(conn)
+    return question_id
+
+
+def update_question(db, question_id, question, answer, options, category=None):
+    """Memperbarui soal dan mengganti opsinya. Mengembalikan False jika soal tidak ada."""
+    with db.transaction() as conn:
+        cursor = conn.execute("UPDATE questions SET question = ?, category = ? WHERE id = ?",
+                              (question, category or None, question_id))
+        if cursor.rowcount == 0:
+            return False
+        conn.execute("DELETE FROM options WHERE question_id = ?", (question_id,))
+        _insert_options(conn, question_id, options, answer)
+        bump_bank_version(conn)
+    return True
+
+
+def delete_question(db, question_id):
+    # Opsi ikut terhapus lewat ON DELETE CASCADE
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+        bump_bank_version(conn)
+
+
+def _new_question(question_id, text, category):
+    return {
+        'id': question_id,
+        'question': text,
+        'category': category,
+        'options': [],
+        'correct_option': None
+    }
+
+
+def _add_options(questions, option_rows):
+    for question_id, option_id, text, is_correct in option_rows:
+        question = questions.get(question_id)
+        if question is None:
+            continue
+        question['options'].append((option_id, text))
+        if is_correct:
+            question['correct_option'] = option_id
+
+
+def load_question_batch(db, rows):
+    """Melengkapi satu batch (id, soal, kategori) berurutan id dengan opsinya dalam satu query terindeks."""
+    questions = {question_id: _new_question(question_id, text, category) for question_id, text, category in rows}
+    _add_options(questions, db.fetchall(
+        "SELECT question_id, id, text, is_correct FROM options "
+        "WHERE question_id BETWEEN ? AND ? ORDER BY question_id, ordinal",
+        (rows[0][0], rows[-1][0])))
+    return list(questions.values())
+
+
+def load_questions_by_ids(db, question_ids):
+    """Memuat soal (beserta opsinya) untuk daftar id acak, dengan urutan sesuai daftar."""
+    if not question_ids:
+        return []
+    placeholders = ', '.join('?' * len(question_ids))
+    rows = db.fetchall(f"SELECT id, question, category FROM questions WHERE id IN ({placeholders})", question_ids)
+    questions = {question_id: _new_question(question_id, text, category) for question_id, text, category in rows}
+    _add_options(questions, db.fetchall(
+        f"SELECT question_id, id, text, is_correct FROM options "
+        f"WHERE question_id IN ({placeholders}) ORDER BY question_id, ordinal", question_ids))
+    # Soal yang terhapus setelah dipilih dilewati
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+
+def load_batch_after(db, last_id, batch_size):
+    """Satu batch soal lengkap dengan id > last_id (atau dari awal jika None)."""
+    if last_id is None:
+        rows = db.fetchall("SELECT id, question, category FROM questions ORDER BY id LIMIT ?", (batch_size,))
+    else:
+        rows = db.fetchall("SELECT id, question, category FROM questions WHERE id > ? ORDER BY id LIMIT ?",
+                           (last_id, batch_size))
+    return load_question_batch(db, rows) if rows else []
+
+
+def count_questions(db):
+    return db.fetchone("SELECT COUNT(*) FROM questions")[0]
+
+
+def iter_question_batches(db, batch_size=100, cache=None):
+    """Menghasilkan soal per batch secara berurutan menurut id.
+
+    Jika ``cache`` (QuestionCache) diberikan, batch yang sudah pernah dibaca
+    diambil dari memori.
+    """
+    last_id = None
+    while True:
+        if cache is None:
+            batch = load_batch_after(db, last_id, batch_size)
+        else:
+            batch = cache.cached(('batch', last_id, batch_size), lambda: load_batch_after(db, last_id, batch_size))
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1]['id']
+
+
+class QuestionStream:
+    """Iterator soal yang dibaca bertahap dari database.
+
+    Soal diambil per batch dengan keyset pagination pada ``questions.id``
+    oleh thread latar belakang dan ditampung di antrean berukuran tetap,
+    sehingga soal pertama bisa ditampilkan tanpa menunggu seluruh bank soal
+    dibaca dan memori tetap terbatas berapa pun jumlah soalnya.
+    """
+
+    _END = object()
+
+    def __init__(self, db, batch_size=20, prefetch_batches=2, cache=None):
+        self.db = db
+        self.batch_size = batch_size
+        self.cache = cache
+        self.total = None
+        self._queue = queue.Queue(maxsize=batch_size * prefetch_batches)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        counted = False
+        try:
+            for batch in iter_question_batches(self.db, self.batch_size, self.cache):
+                for question in batch:
+                    if not self._put(question):
+                        return
+                if not counted:
+                    # Jumlah soal dihitung setelah batch pertama siap
+                    if self.cache is None:
+                        self.total = count_questions(self.db)
+                    else:
+                        self.total = self.cache.cached(('count',), lambda: count_questions(self.db))
+                    counted = True
+                if self._stop.is_set():
+                    return
+            if not counted:
+                self.total = 0
+        except Exception as e:
+            self._put(e)
+        finally:
+            # Setiap stream punya thread sendiri; koneksinya ditutup agar tidak menumpuk di Database
+            self.db.release()
+        self._put(self._END)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop.is_set():
+            raise StopIteration
+        return self._unwrap(self._queue.get())
+
+    def next_nowait(self):
+        """Seperti next(), tetapi melempar queue.Empty jika soal berikutnya belum dibaca.
+
+        Dipakai dari thread GUI agar tidak menunggu thread pembaca.
+        """
+        if self._stop.is_set():
+            raise StopIteration
+        return self._unwrap(self._queue.get_nowait())
+
+    def _unwrap(self, item):
+        if item is self._END:
+            self._stop.set()
+            raise StopIteration
+        if isinstance(item, Exception):
+            self._stop.set()
+            raise item
+        return item
+
+    def close(self):
+        """Menghentikan thread pembaca dan membuang soal yang tersisa."""
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,99 @@
+"""Pembatas laju login (token bucket) dan penguncian akun setelah gagal berulang.
+
+``LoginLimiter.check`` hanya memakai memori, sehingga percobaan yang
+ditolak tidak pernah sampai ke hashing password maupun query database.
+Ada dua bucket: satu per username dan satu global untuk seluruh proses.
+Status kunci akun disimpan di tabel ``login_lockouts`` di users.db (lihat
+``auth.login``) dan disalin ke memori lewat ``lock``/``unlock``.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Per username: 5 percobaan beruntun, lalu 1 percobaan tiap 10 detik
+USER_BURST = 5
+USER_RATE = 0.1
+# Global: 20 percobaan beruntun, lalu 5 per detik
+GLOBAL_BURST = 20
+GLOBAL_RATE = 5.0
+# Batas jumlah bucket username di memori; yang paling lama tidak dipakai dibuang
+MAX_TRACKED_USERS = 10_000
+
+
+class TokenBucket:
+    """Bucket berisi ``capacity`` token yang terisi ``rate`` token per detik."""
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        """Mengambil satu token; False jika bucket kosong."""
+        self._refill(now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def wait_time(self, now):
+        """Detik sampai satu token tersedia lagi."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class LoginLimiter:
+    """Token bucket per username dan global, ditambah daftar akun terkunci.
+
+    ``check`` dipanggil sebelum login dan mengembalikan jumlah detik yang
+    harus ditunggu (0 jika boleh lanjut). Aman dipakai dari banyak thread.
+    """
+
+    def __init__(self, user_burst=USER_BURST, user_rate=USER_RATE,
+                 global_burst=GLOBAL_BURST, global_rate=GLOBAL_RATE, clock=time.monotonic):
+        self.user_burst = user_burst
+        self.user_rate = user_rate
+        self.clock = clock
+        self._global = TokenBucket(global_burst, global_rate, clock())
+        self._users = OrderedDict()
+        # username -> waktu (time.time()) kunci berakhir
+        self._locked = {}
+        self._lock = threading.Lock()
+
+    def check(self, username):
+        with self._lock:
+            locked_until = self._locked.get(username)
+            if locked_until is not None:
+                remaining = locked_until - time.time()
+                if remaining > 0:
+                    return remaining
+                del self._locked[username]
+
+            now = self.clock()
+            bucket = self._users.get(username)
+            if bucket is None:
+                bucket = self._users[username] = TokenBucket(self.user_burst, self.user_rate, now)
+                if len(self._users) > MAX_TRACKED_USERS:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(username)
+            if not bucket.take(now):
+                return bucket.wait_time(now)
+            if not self._global.take(now):
+                return self._global.wait_time(now)
+            return 0.0
+
+    def lock(self, username, until):
+        with self._lock:
+            self._locked[username] = until
+
+    def unlock(self, username):
+        with self._lock:
+            self._locked.pop(username, None)
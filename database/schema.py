@@ -0,0 +1,306 @@
+"""Skema database user dan soal, serta migrasi dari kolom ``options`` berbentuk CSV.
+
+Dapat dijalankan langsung untuk memigrasi file yang sudah ada::
+
+    python -m database.schema database/questions.db
+"""
+import sys
+
+from database import Database
+from database.stats import DIFFICULTY_SQL, rebuild_stats
+
+QUESTIONS_SCHEMA_VERSION = 8
+
+
+def migrate_users_db(db):
+    """Membuat tabel users beserta indeks covering untuk lookup login, dan tabel kunci akun."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL
+        )
+    ''')
+    # id ikut tersimpan di indeks sebagai rowid, sehingga login tidak perlu membaca tabel
+    db.execute("CREATE INDEX IF NOT EXISTS idx_users_login ON users(username, password)")
+    # Hitungan password salah dan waktu kunci akun berakhir (detik epoch); baris dihapus saat login berhasil
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS login_lockouts (
+            user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+            failures INTEGER NOT NULL,
+            locked_until REAL
+        )
+    ''')
+
+
+def split_legacy_options(answer, options):
+    """Memecah kolom options lama menjadi daftar (teks, is_correct); opsi kembar hanya diambil sekali."""
+    answer = (answer or '').strip()
+    texts = list(dict.fromkeys(text.strip() for text in (options or '').split(',') if text.strip()))
+    result = [(text, int(text == answer)) for text in texts]
+    if answer and answer not in texts:
+        # Jawaban lama yang tidak ada di opsi ditambahkan sebagai opsi benar
+        result.append((answer, 1))
+    return result
+
+
+def _create_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            question TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS options (
+            id INTEGER PRIMARY KEY,
+            question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+            ordinal INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            is_correct INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (question_id, ordinal)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_options_correct ON options(question_id) WHERE is_correct")
+
+
+def _create_search_index(conn):
+    """Indeks FTS5 untuk teks soal dan opsi (termasuk jawaban), dijaga oleh trigger.
+
+    Trigger bisa dimatikan sementara lewat tabel ``search_sync`` agar impor
+    massal dapat mengisi indeks sekaligus (lihat ``reindex_questions_from``).
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS search_sync (enabled INTEGER NOT NULL)")
+    conn.execute("INSERT INTO search_sync (enabled) SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM search_sync)")
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts
+        USING fts5(question, content='questions', content_rowid='id')
+    """)
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS options_fts
+        USING fts5(text, content='options', content_rowid='id')
+    """)
+    for table, fts, column in (('questions', 'questions_fts', 'question'), ('options', 'options_fts', 'text')):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table}
+            WHEN (SELECT enabled FROM search_sync) BEGIN
+                INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table}
+            WHEN (SELECT enabled FROM search_sync) BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {column} ON {table}
+            WHEN (SELECT enabled FROM search_sync) BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+                INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def reindex_questions_from(conn, first_id):
+    """Mengisi indeks FTS untuk soal dengan id >= first_id yang disisipkan saat trigger mati."""
+    conn.execute("INSERT INTO questions_fts (rowid, question) SELECT id, question FROM questions WHERE id >= ?",
+                 (first_id,))
+    conn.execute("INSERT INTO options_fts (rowid, text) SELECT id, text FROM options WHERE question_id >= ?",
+                 (first_id,))
+
+
+def bump_bank_version(conn):
+    """Menandai bank soal berubah, sehingga cache soal di semua proses dibuang."""
+    conn.execute("UPDATE bank_version SET version = version + 1")
+
+
+def _create_attempt_tables(conn):
+    """Riwayat percobaan kuis dan jawabannya.
+
+    ``user_id`` merujuk ke ``users.id`` di users.db; karena berada di file
+    database lain, relasi ini tidak bisa dijaga dengan foreign key.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            score INTEGER NOT NULL DEFAULT 0,
+            answered INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attempts_user ON attempts(user_id)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS attempt_answers (
+            attempt_id INTEGER NOT NULL REFERENCES attempts(id) ON DELETE CASCADE,
+            question_id INTEGER NOT NULL,
+            option_id INTEGER,
+            is_correct INTEGER NOT NULL,
+            answered_at TEXT NOT NULL,
+            PRIMARY KEY (attempt_id, question_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attempt_answers_question ON attempt_answers(question_id)")
+
+
+def _create_stats_tables(conn):
+    """Agregat statistik soal dan skor terbaik user, diisi dari riwayat yang sudah ada."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS question_stats (
+            question_id INTEGER PRIMARY KEY REFERENCES questions(id) ON DELETE CASCADE,
+            answered INTEGER NOT NULL,
+            correct INTEGER NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_question_stats_rate
+        ON question_stats(correct * 1.0 / answered, question_id)
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_scores (
+            user_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            best_score INTEGER NOT NULL,
+            best_answered INTEGER NOT NULL,
+            best_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_scores_rank ON user_scores(best_score DESC, best_at, user_id)")
+    rebuild_stats(conn)
+
+
+def _add_selection_keys(conn):
+    """Kolom untuk memilih soal acak tanpa ORDER BY RANDOM().
+
+    ``rand_key`` adalah bilangan acak 64-bit yang tetap per soal; sampel acak
+    diambil dengan mencari rand_key terdekat dari titik acak lewat indeks.
+    ``difficulty`` (0 mudah, 1 sedang, 2 sulit) disalin dari question_stats.
+    """
+    conn.execute("ALTER TABLE questions ADD COLUMN category TEXT")
+    conn.execute("ALTER TABLE questions ADD COLUMN rand_key INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE questions ADD COLUMN difficulty INTEGER NOT NULL DEFAULT 1")
+    conn.execute("UPDATE questions SET rand_key = random()")
+    conn.execute(f"""
+        UPDATE questions SET difficulty = (SELECT {DIFFICULTY_SQL} FROM question_stats WHERE question_id = questions.id)
+        WHERE id IN (SELECT question_id FROM question_stats)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_rand ON questions(rand_key)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_category ON questions(category, rand_key)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty, rand_key)")
+
+
+def _create_bank_version(conn):
+    """Penghitung versi bank soal, dinaikkan oleh setiap tambah/edit/hapus/impor soal."""
+    conn.execute("CREATE TABLE IF NOT EXISTS bank_version (version INTEGER NOT NULL)")
+    conn.execute("INSERT INTO bank_version (version) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM bank_version)")
+
+
+def _unique_correct_option(conn):
+    """Membuang opsi kembar dalam satu soal dan memastikan hanya ada satu opsi benar.
+
+    Opsi dengan ordinal terkecil yang dipertahankan, baik untuk teks kembar
+    maupun jika lebih dari satu opsi ditandai benar.
+    """
+    conn.execute("""
+        DELETE FROM options WHERE EXISTS (
+            SELECT 1 FROM options AS first
+            WHERE first.question_id = options.question_id AND first.text = options.text
+              AND first.ordinal < options.ordinal
+        )
+    """)
+    conn.execute("""
+        UPDATE options SET is_correct = 0 WHERE is_correct AND EXISTS (
+            SELECT 1 FROM options AS first
+            WHERE first.question_id = options.question_id AND first.is_correct
+              AND first.ordinal < options.ordinal
+        )
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_options_correct")
+    conn.execute("CREATE UNIQUE INDEX idx_options_correct ON options(question_id) WHERE is_correct")
+    bump_bank_version(conn)
+
+
+def _drop_rand_key(conn):
+    """Menghapus rand_key: pemilihan acak kini mengundi id langsung (lihat database.selection).
+
+    Memilih rand_key terdekat di atas titik acak membuat peluang tiap soal
+    sebanding dengan jarak ke rand_key sebelumnya, yang tidak pernah berubah.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_questions_rand")
+    conn.execute("DROP INDEX IF EXISTS idx_questions_category")
+    conn.execute("DROP INDEX IF EXISTS idx_questions_difficulty")
+    conn.execute("ALTER TABLE questions DROP COLUMN rand_key")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_category ON questions(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty)")
+
+
+def _legacy_option_rows(conn):
+    for question_id, answer, options in conn.execute("SELECT id, answer, options FROM questions_old"):
+        for ordinal, (text, is_correct) in enumerate(split_legacy_options(answer, options)):
+            yield question_id, ordinal, text, is_correct
+
+
+def _migrate_to_v1(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(questions)")]
+    legacy = 'options' in columns
+    if legacy:
+        conn.execute("ALTER TABLE questions RENAME TO questions_old")
+
+    _create_tables(conn)
+
+    if legacy:
+        conn.execute("INSERT INTO questions (id, question) SELECT id, COALESCE(question, '') FROM questions_old")
+        conn.executemany(
+            "INSERT INTO options (question_id, ordinal, text, is_correct) VALUES (?, ?, ?, ?)",
+            _legacy_option_rows(conn))
+        conn.execute("DROP TABLE questions_old")
+
+
+# Langkah migrasi sesuai urutan versi skema
+QUESTIONS_MIGRATIONS = {
+    1: _migrate_to_v1,
+    2: _create_search_index,
+    3: _create_attempt_tables,
+    4: _create_stats_tables,
+    5: _add_selection_keys,
+    6: _create_bank_version,
+    7: _unique_correct_option,
+    8: _drop_rand_key,
+}
+
+
+def migrate_questions_db(db):
+    """Membuat atau memigrasi skema database soal ke versi terbaru.
+
+    Mengembalikan versi skema setelah migrasi.
+    """
+    version = db.fetchone("PRAGMA user_version")[0]
+    if version >= QUESTIONS_SCHEMA_VERSION:
+        return version
+
+    with db.transaction() as conn:
+        for target in range(version + 1, QUESTIONS_SCHEMA_VERSION + 1):
+            QUESTIONS_MIGRATIONS[target](conn)
+        conn.execute(f"PRAGMA user_version = {QUESTIONS_SCHEMA_VERSION}")
+    return QUESTIONS_SCHEMA_VERSION
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Penggunaan: python -m database.schema <questions.db> [...]")
+        return 1
+    for path in argv:
+        db = Database(path)
+        before = db.fetchone("PRAGMA user_version")[0]
+        after = migrate_questions_db(db)
+        db.close()
+        print(f"{path}: versi skema {before} -> {after}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
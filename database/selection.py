@@ -0,0 +1,117 @@
+"""Pemilihan soal acak, per kategori, atau berbobot kesulitan tanpa memuat seluruh bank soal.
+
+Soal acak dipilih dengan mengundi id seragam di antara MIN(id) dan MAX(id)
+lalu memeriksanya lewat primary key; id yang sudah dihapus atau tidak cocok
+dengan filter diundi ulang. Setiap soal yang cocok punya peluang yang sama,
+dan biayanya O(log n) per undian, bukan ORDER BY RANDOM() atas seluruh tabel.
+Jika filter terlalu jarang cocok (mis. kategori kecil), id yang cocok dibaca
+dari indeks filternya (``idx_questions_category``, ``idx_questions_difficulty``)
+lalu diambil sampelnya.
+"""
+import random
+
+DEFAULT_QUIZ_SIZE = 10
+
+# Bobot pemilihan per tingkat kesulitan (0 mudah, 1 sedang, 2 sulit)
+DIFFICULTY_WEIGHTS = {0: 1, 1: 2, 2: 3}
+
+# Jumlah undian id per soal yang dicoba sebelum beralih membaca semua id yang cocok
+PROBES_PER_QUESTION = 20
+# Batas jumlah id yang diperiksa dalam satu query
+PROBE_BATCH = 256
+
+
+def _filters(category, difficulty, prefix=''):
+    """Kondisi WHERE untuk filter soal; ``prefix='+'`` mencegah planner memakai indeks kolom filter."""
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append(f"{prefix}category = ?")
+        params.append(category)
+    if difficulty is not None:
+        conditions.append(f"{prefix}difficulty = ?")
+        params.append(difficulty)
+    return conditions, params
+
+
+def _probe(db, question_ids, category, difficulty):
+    """Subset ``question_ids`` yang ada dan cocok dengan filter, dicari lewat primary key."""
+    conditions, params = _filters(category, difficulty, prefix='+')
+    placeholders = ", ".join("?" * len(question_ids))
+    where = " AND ".join([f"id IN ({placeholders})"] + conditions)
+    return {row[0] for row in db.fetchall(f"SELECT id FROM questions WHERE {where}", list(question_ids) + params)}
+
+
+def sample_question_ids(db, count, category=None, difficulty=None, exclude=(), rng=random):
+    """Mengambil sampai ``count`` id soal acak yang berbeda dan tidak ada di ``exclude``.
+
+    Setiap soal dipilih seragam di antara soal cocok yang belum terpilih.
+    """
+    chosen = []
+    seen = set(exclude)
+    # Subquery terpisah: MIN dan MAX dalam satu SELECT memindai seluruh tabel, bukan dua lompatan di primary key
+    low, high = db.fetchone("SELECT (SELECT MIN(id) FROM questions), (SELECT MAX(id) FROM questions)")
+    if low is None:
+        return chosen
+
+    probes_left = count * PROBES_PER_QUESTION
+    while len(chosen) < count and probes_left > 0:
+        batch = [rng.randint(low, high) for _ in range(min((count - len(chosen)) * 2, PROBE_BATCH, probes_left))]
+        probes_left -= len(batch)
+        found = _probe(db, batch, category, difficulty)
+        # Diproses sesuai urutan undian agar id kembar dalam satu batch tidak menggeser peluang
+        for question_id in batch:
+            if question_id in found and question_id not in seen:
+                seen.add(question_id)
+                chosen.append(question_id)
+                if len(chosen) >= count:
+                    return chosen
+
+    # Filter jarang cocok: sisa soal diambil dari semua id yang cocok
+    conditions, params = _filters(category, difficulty)
+    where = " AND ".join(conditions) or "1"
+    remaining = [row[0] for row in db.fetchall(f"SELECT id FROM questions WHERE {where}", params)
+                 if row[0] not in seen]
+    chosen += rng.sample(remaining, min(count - len(chosen), len(remaining)))
+    return chosen
+
+
+def select_question_ids(db, count=DEFAULT_QUIZ_SIZE, category=None, weighted=False, rng=random):
+    """Memilih id soal untuk satu kuis.
+
+    Dengan ``weighted=True`` soal sulit lebih sering terpilih sesuai
+    DIFFICULTY_WEIGHTS; jika soal di satu tingkat kurang, kekurangannya
+    diisi dari semua tingkat.
+    """
+    if not weighted:
+        return sample_question_ids(db, count, category, rng=rng)
+
+    levels = list(DIFFICULTY_WEIGHTS)
+    wanted = dict.fromkeys(levels, 0)
+    for level in rng.choices(levels, weights=[DIFFICULTY_WEIGHTS[level] for level in levels], k=count):
+        wanted[level] += 1
+
+    chosen = []
+    for level, level_count in wanted.items():
+        if level_count:
+            chosen += sample_question_ids(db, level_count, category, level, exclude=chosen, rng=rng)
+    if len(chosen) < count:
+        chosen += sample_question_ids(db, count - len(chosen), category, exclude=chosen, rng=rng)
+    rng.shuffle(chosen)
+    return chosen
+
+
+def list_categories(db):
+    """Daftar kategori berbeda, dibaca dengan melompat di idx_questions_category.
+
+    Biayanya sebanding dengan jumlah kategori, bukan jumlah soal.
+    """
+    return [row[0] for row in db.fetchall("""
+        WITH RECURSIVE categories(name) AS (
+            SELECT MIN(category) FROM questions
+            UNION ALL
+            SELECT (SELECT MIN(category) FROM questions WHERE category > name)
+            FROM categories WHERE name IS NOT NULL
+        )
+        SELECT name FROM categories WHERE name IS NOT NULL
+    """)]
@@ -0,0 +1,132 @@
+"""Statistik soal dan papan peringkat yang dijaga secara inkremental.
+
+Tabel ``question_stats`` dan ``user_scores`` diperbarui di transaksi yang
+sama dengan penulisan jawaban (lihat ``AttemptRecorder.flush``), sehingga
+tampilan statistik cukup membaca satu halaman indeks tanpa memindai seluruh
+tabel ``attempt_answers``.
+"""
+
+# Tingkat kesulitan dari jumlah jawaban: 0 mudah, 1 sedang, 2 sulit.
+# Soal yang baru dijawab kurang dari MIN_ANSWERS kali tetap dianggap sedang.
+MIN_ANSWERS = 3
+DIFFICULTY_SQL = f"""
+    CASE WHEN answered < {MIN_ANSWERS} THEN 1
+         WHEN correct * 10 < answered * 4 THEN 2
+         WHEN correct * 10 < answered * 7 THEN 1
+         ELSE 0 END
+"""
+
+# Soal yang sudah dihapus dilewati agar foreign key tidak menggagalkan flush
+QUESTION_STATS_UPSERT_SQL = """
+    INSERT INTO question_stats (question_id, answered, correct)
+    SELECT ?, 1, ? WHERE EXISTS (SELECT 1 FROM questions WHERE id = ?)
+    ON CONFLICT (question_id) DO UPDATE SET
+        answered = answered + 1,
+        correct = correct + excluded.correct
+"""
+
+# Skor terbaik hanya diganti jika lebih tinggi; skor sama tetap memakai waktu yang lebih awal
+USER_SCORE_UPSERT_SQL = """
+    INSERT INTO user_scores (user_id, attempts, best_score, best_answered, best_at)
+    VALUES (?, 1, ?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        attempts = attempts + 1,
+        best_answered = CASE WHEN excluded.best_score > best_score
+                             THEN excluded.best_answered ELSE best_answered END,
+        best_at = CASE WHEN excluded.best_score > best_score
+                       THEN excluded.best_at ELSE best_at END,
+        best_score = MAX(best_score, excluded.best_score)
+"""
+
+
+DIFFICULTY_UPDATE_SQL = f"""
+    UPDATE questions SET difficulty = (SELECT {DIFFICULTY_SQL} FROM question_stats WHERE question_id = ?)
+    WHERE id = ?
+"""
+
+
+def record_answers(conn, rows):
+    """Menambahkan jawaban baru ke statistik soal dan memperbarui tingkat kesulitannya.
+
+    ``rows`` berisi tuple (question_id, option_id, is_correct, answered_at)
+    seperti buffer AttemptRecorder.
+    """
+    conn.executemany(QUESTION_STATS_UPSERT_SQL,
+                     [(question_id, is_correct, question_id) for question_id, _, is_correct, _ in rows])
+    question_ids = {row[0] for row in rows}
+    conn.executemany(DIFFICULTY_UPDATE_SQL, [(question_id, question_id) for question_id in question_ids])
+
+
+def record_finished_attempt(conn, user_id, score, answered, finished_at):
+    """Memperbarui skor terbaik user setelah satu percobaan selesai."""
+    if user_id is None:
+        return
+    conn.execute(USER_SCORE_UPSERT_SQL, (user_id, score, answered, finished_at))
+
+
+def rebuild_stats(conn):
+    """Menghitung ulang semua agregat dari riwayat percobaan (dipakai saat migrasi)."""
+    conn.execute("DELETE FROM question_stats")
+    conn.execute("""
+        INSERT INTO question_stats (question_id, answered, correct)
+        SELECT a.question_id, COUNT(*), SUM(a.is_correct)
+        FROM attempt_answers a JOIN questions q ON q.id = a.question_id
+        GROUP BY a.question_id
+    """)
+    conn.execute("DELETE FROM user_scores")
+    for user_id, score, answered, finished_at in conn.execute("""
+            SELECT user_id, score, answered, finished_at FROM attempts
+            WHERE user_id IS NOT NULL AND finished_at IS NOT NULL
+            ORDER BY id""").fetchall():
+        record_finished_attempt(conn, user_id, score, answered, finished_at)
+
+
+def fetch_leaderboard(db, users_db, after=None, limit=50):
+    """Mengambil satu halaman papan peringkat dengan keyset pagination.
+
+    ``after`` adalah kunci baris terakhir halaman sebelumnya, yaitu tuple
+    (best_score, best_at, user_id). Nama user diambil dari users.db hanya
+    untuk baris di halaman ini. Mengembalikan daftar tuple
+    (user_id, username, best_score, best_answered, attempts, best_at).
+    """
+    sql = "SELECT user_id, best_score, best_answered, attempts, best_at FROM user_scores"
+    params = []
+    if after is not None:
+        best_score, best_at, user_id = after
+        # best_score <= ? membatasi rentang indeks; sisanya memilah skor yang sama
+        sql += " WHERE best_score <= ? AND (best_score < ? OR (best_at, user_id) > (?, ?))"
+        params.extend((best_score, best_score, best_at, user_id))
+    sql += " ORDER BY best_score DESC, best_at, user_id LIMIT ?"
+    params.append(limit)
+    rows = db.fetchall(sql, params)
+    if not rows:
+        return []
+
+    ids = [row[0] for row in rows]
+    names = dict(users_db.fetchall(
+        f"SELECT id, username FROM users WHERE id IN ({', '.join('?' * len(ids))})", ids))
+    return [(user_id, names.get(user_id, f"(user #{user_id})"), best_score, best_answered, attempts, best_at)
+            for user_id, best_score, best_answered, attempts, best_at in rows]
+
+
+def fetch_question_stats(db, after=None, limit=50):
+    """Mengambil satu halaman soal dari yang paling sulit (persentase benar terendah).
+
+    ``after`` adalah tuple (rate, question_id) dari baris terakhir halaman
+    sebelumnya. Mengembalikan daftar tuple
+    (question_id, question, answered, correct, rate) dengan rate 0..1.
+    """
+    # Ekspresi rate harus sama persis dengan idx_question_stats_rate agar indeks terpakai
+    sql = """
+        SELECT s.question_id, q.question, s.answered, s.correct, s.correct * 1.0 / s.answered
+        FROM question_stats s JOIN questions q ON q.id = s.question_id
+    """
+    params = []
+    if after is not None:
+        rate, question_id = after
+        sql += (" WHERE s.correct * 1.0 / s.answered >= ?"
+                " AND (s.correct * 1.0 / s.answered > ? OR s.question_id > ?)")
+        params.extend((rate, rate, question_id))
+    sql += " ORDER BY s.correct * 1.0 / s.answered, s.question_id LIMIT ?"
+    params.append(limit)
+    return db.fetchall(sql, params)
@@ -0,0 +1,255 @@
+"""Impor dan ekspor bank soal secara streaming (CSV / JSON).
+
+Format yang didukung:
+
+* ``.csv``   -- baris ``question,answer,option1,option2,...`` (header opsional)
+* ``.jsonl`` -- satu objek ``{"question", "answer", "options": [...], "category"}`` per baris
+* ``.json``  -- array objek yang sama (saat impor dibaca bertahap per objek)
+
+``category`` bersifat opsional dan tidak ikut dalam format CSV.
+
+Contoh penggunaan tanpa GUI::
+
+    python -m database.transfer import soal.csv
+    python -m database.transfer export soal.jsonl --db salinan/questions.db
+
+Tanpa ``--db`` dipakai ``database.QUESTIONS_DB_PATH``, dari folder mana pun dijalankan.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from database import Database, QUESTIONS_DB_PATH
+from database.questions import iter_question_batches
+from database.schema import bump_bank_version, migrate_questions_db, reindex_questions_from
+
+DEFAULT_BATCH_SIZE = 1000
+# Jumlah karakter yang dibaca sekali jalan saat mengurai array .json
+JSON_READ_CHARS = 64 * 1024
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.csv', '.json', '.jsonl'):
+        return ext[1:]
+    raise ValueError(f"Format file tidak dikenal: {path}")
+
+
+def _read_csv(handle):
+    for line_number, row in enumerate(csv.reader(handle)):
+        # Header hanya dikenali di baris pertama
+        if not row or (line_number == 0 and row[0].strip().lower() == 'question'):
+            continue
+        yield {
+            'question': row[0],
+            'answer': row[1] if len(row) > 1 else '',
+            'options': row[2:]
+        }
+
+
+def _read_jsonl(handle):
+    for line in handle:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _read_json_array(handle, read_chars=JSON_READ_CHARS):
+    """Menghasilkan elemen array JSON satu per satu tanpa memuat seluruh file."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def skip(chars):
+        nonlocal pos
+        while pos < len(buffer) and buffer[pos] in chars:
+            pos += 1
+
+    while True:
+        skip(' \t\r\n,' if started else ' \t\r\n\ufeff')
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("File .json harus berisi array soal")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                item = None
+                end = len(buffer)
+            # Angka yang terpotong di ujung buffer (mis. "1." atau "10e") bisa terbaca sebagian;
+            # elemen hanya diterima jika diikuti pemisah atau file sudah habis
+            if eof or (end < len(buffer) and buffer[end] in ' \t\r\n,]'):
+                yield item
+                pos = end
+                continue
+        elif eof:
+            raise ValueError("Array .json tidak ditutup")
+        chunk = handle.read(read_chars)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def read_records(path):
+    """Menghasilkan record soal dari file satu per satu."""
+    fmt = detect_format(path)
+    with open(path, newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            yield from _read_csv(handle)
+        elif fmt == 'jsonl':
+            yield from _read_jsonl(handle)
+        else:
+            yield from _read_json_array(handle)
+
+
+def normalize_record(record):
+    """Merapikan satu record; mengembalikan None jika record tidak valid."""
+    if not isinstance(record, dict):
+        return None
+    question = str(record.get('question') or '').strip()
+    answer = str(record.get('answer') or '').strip()
+    # Opsi kembar hanya disimpan sekali agar tepat satu opsi yang benar
+    options = list(dict.fromkeys(str(option).strip() for option in record.get('options') or ()
+                                 if str(option).strip()))
+    category = str(record.get('category') or '').strip() or None
+    if not question or not answer or answer not in options:
+        return None
+    return question, answer, options, category
+
+
+def insert_batch(conn, records):
+    """Menyisipkan satu batch soal dengan executemany di transaksi yang sedang berjalan.
+
+    Trigger FTS dimatikan selama batch disisipkan lalu indeks diisi sekaligus,
+    jauh lebih cepat daripada satu sisipan FTS per baris.
+    """
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM questions").fetchone()[0]
+    question_rows = []
+    option_rows = []
+    for offset, (question, answer, options, category) in enumerate(records):
+        question_id = next_id + offset
+        question_rows.append((question_id, question, category))
+        option_rows.extend((question_id, ordinal, text, int(text == answer))
+                           for ordinal, text in enumerate(options))
+    conn.execute("UPDATE search_sync SET enabled = 0")
+    try:
+        conn.executemany("INSERT INTO questions (id, question, category) VALUES (?, ?, ?)",
+                         question_rows)
+        conn.executemany("INSERT INTO options (question_id, ordinal, text, is_correct) VALUES (?, ?, ?, ?)",
+                         option_rows)
+        reindex_questions_from(conn, next_id)
+        bump_bank_version(conn)
+    finally:
+        conn.execute("UPDATE search_sync SET enabled = 1")
+
+
+def import_questions(db, path, batch_size=DEFAULT_BATCH_SIZE, progress=None, cancelled=None):
+    """Mengimpor soal dari file dalam batch, satu transaksi per batch.
+
+    ``progress(imported, skipped)`` dipanggil setiap selesai satu batch.
+    Mengembalikan tuple (jumlah diimpor, jumlah dilewati).
+    """
+    migrate_questions_db(db)
+    imported = skipped = 0
+    records = read_records(path)
+    while True:
+        if cancelled is not None and cancelled():
+            break
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        valid = []
+        for record in chunk:
+            normalized = normalize_record(record)
+            if normalized is None:
+                skipped += 1
+            else:
+                valid.append(normalized)
+        if valid:
+            with db.transaction() as conn:
+                insert_batch(conn, valid)
+            imported += len(valid)
+        if progress is not None:
+            progress(imported, skipped)
+    return imported, skipped
+
+
+def _export_record(question):
+    correct = dict(question['options']).get(question['correct_option'], '')
+    record = {
+        'question': question['question'],
+        'answer': correct,
+        'options': [text for _, text in question['options']]
+    }
+    if question['category']:
+        record['category'] = question['category']
+    return record
+
+
+def export_questions(db, path, batch_size=DEFAULT_BATCH_SIZE, progress=None, cancelled=None):
+    """Mengekspor seluruh soal ke file secara bertahap. Mengembalikan jumlah soal."""
+    fmt = detect_format(path)
+    exported = 0
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle) if fmt == 'csv' else None
+        if fmt == 'csv':
+            writer.writerow(['question', 'answer', 'options'])
+        elif fmt == 'json':
+            handle.write('[')
+        for batch in iter_question_batches(db, batch_size):
+            if cancelled is not None and cancelled():
+                break
+            for question in batch:
+                record = _export_record(question)
+                if fmt == 'csv':
+                    writer.writerow([record['question'], record['answer'], *record['options']])
+                elif fmt == 'jsonl':
+                    handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+                else:
+                    handle.write((',' if exported else '') + '\n' + json.dumps(record, ensure_ascii=False))
+                exported += 1
+            if progress is not None:
+                progress(exported)
+        if fmt == 'json':
+            handle.write('\n]\n')
+    return exported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Impor/ekspor bank soal.")
+    parser.add_argument('action', choices=('import', 'export'))
+    parser.add_argument('path')
+    parser.add_argument('--db', default=QUESTIONS_DB_PATH)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    if args.action == 'import':
+        imported, skipped = import_questions(
+            db, args.path, args.batch_size,
+            progress=lambda done, bad: print(f"\r{done} soal diimpor, {bad} dilewati", end='', flush=True))
+        print(f"\nSelesai: {imported} soal diimpor, {skipped} dilewati.")
+    else:
+        migrate_questions_db(db)
+        exported = export_questions(
+            db, args.path, args.batch_size,
+            progress=lambda done: print(f"\r{done} soal diekspor", end='', flush=True))
+        print(f"\nSelesai: {exported} soal diekspor.")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
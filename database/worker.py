@@ -0,0 +1,155 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """Satu pekerjaan database yang dijalankan di thread latar belakang."""
+
+    def __init__(self, worker, on_success=None, on_error=None, indicator=None, owner=None, on_discard=None):
+        self.worker = worker
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_discard = on_discard
+        self.indicator = indicator
+        self.owner = owner
+        self.future = None
+        self.cancelled = False
+        # Koneksi yang sedang dipakai job, untuk menghentikan query yang berjalan.
+        # Dijaga lock agar interrupt tidak mengenai job berikutnya di koneksi yang sama.
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        """Membatalkan job; callback tidak akan dipanggil lagi."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.future is not None and self.future.cancel():
+            # Job belum sempat berjalan, laporkan selesai secara langsung
+            self.worker.results.put((self, 'cancelled', None))
+            return
+        with self.lock:
+            if self.connection is not None:
+                self.connection.interrupt()
+
+
+class DatabaseWorker:
+    """Menjalankan pekerjaan database di thread pool dan mengirim hasilnya ke Tk.
+
+    Hasil job dikumpulkan di antrean lalu diambil dari thread Tk dengan
+    ``root.after``, sehingga callback ``on_success``/``on_error`` selalu
+    berjalan di thread GUI.
+
+    Jika ``metrics`` diberikan (punya method observe/increment), lama setiap
+    job dicatat per nama fungsi sebagai ``db.<nama>``.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, root, max_workers=2, metrics=None):
+        self.root = root
+        self.metrics = metrics
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-worker')
+        self.results = queue.SimpleQueue()
+        self.pending = 0
+        self._polling = False
+
+    def submit(self, fn, *args, on_success=None, on_error=None, db=None, indicator=None, owner=None,
+               on_discard=None, **kwargs):
+        """Menjadwalkan ``fn(*args, **kwargs)`` di thread latar belakang.
+
+        Jika ``db`` diberikan, query yang sedang berjalan di koneksi thread
+        tersebut dihentikan saat job dibatalkan. ``indicator`` (punya method
+        start/stop) ditampilkan selama job berjalan. Callback tidak dipanggil
+        jika widget ``owner`` sudah ditutup; hasil yang tidak jadi dipakai
+        diserahkan ke ``on_discard`` (mis. untuk menutup sesi yang terlanjur dibuat).
+        """
+        job = Job(self, on_success, on_error, indicator, owner, on_discard)
+        if indicator is not None:
+            indicator.start()
+        self.pending += 1
+        job.future = self.executor.submit(self._run, job, fn, args, kwargs, db)
+        self._ensure_polling()
+        return job
+
+    def post(self, callback, *args):
+        """Memanggil ``callback(*args)`` di thread GUI; aman dipanggil dari job."""
+        self.results.put((None, 'call', (callback, args)))
+
+    def _run(self, job, fn, args, kwargs, db):
+        if job.cancelled:
+            self.results.put((job, 'cancelled', None))
+            return
+        start = time.perf_counter()
+        try:
+            if db is not None:
+                with job.lock:
+                    job.connection = db.connection()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                # Dilepas sebelum hasil dikirim, jadi cancel() tidak lagi bisa menghentikan koneksi ini
+                with job.lock:
+                    job.connection = None
+        except Exception as e:
+            self._record(fn, start, failed=True)
+            self.results.put((job, 'error', e))
+        else:
+            self._record(fn, start)
+            self.results.put((job, 'ok', result))
+
+    def _record(self, fn, start, failed=False):
+        if self.metrics is None:
+            return
+        name = 'db.' + getattr(fn, '__name__', 'job')
+        self.metrics.observe(name, (time.perf_counter() - start) * 1000)
+        if failed:
+            self.metrics.increment(name + '.error')
+
+    def _dispatch(self, job, kind, value):
+        if kind == 'call':
+            callback, args = value
+            callback(*args)
+            return
+        self.pending -= 1
+        owner_gone = job.owner is not None and not job.owner.winfo_exists()
+        if not owner_gone and job.indicator is not None:
+            job.indicator.stop()
+        if owner_gone or job.cancelled or kind == 'cancelled':
+            if kind == 'ok' and job.on_discard is not None:
+                job.on_discard(value)
+            return
+        if kind == 'ok':
+            if job.on_success is not None:
+                job.on_success(value)
+        elif job.on_error is not None:
+            job.on_error(value)
+        else:
+            logging.error(f"Job database gagal: {value}")
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                job, kind, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._dispatch(job, kind, value)
+            except Exception:
+                logging.exception("Callback job database gagal")
+
+        if self.pending > 0:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
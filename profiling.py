@@ -0,0 +1,56 @@
+"""Pengukuran waktu callback tombol GUI yang bisa diaktifkan saat dibutuhkan.
+
+Aktif lewat variabel lingkungan sebelum aplikasi dijalankan::
+
+    QUIZ_PROFILE=time python "Project GUI.py"      # lama setiap callback
+    QUIZ_PROFILE=cprofile python "Project GUI.py"  # ditambah ringkasan cProfile
+
+Hasil dicatat lewat logger ``quiz.profile`` (ke app.log jika
+``telemetry.setup_logging`` sudah dipanggil) dan lama callback juga masuk
+histogram ``callback.<nama>`` di ``telemetry.metrics``. Tanpa variabel
+tersebut ``profiled`` mengembalikan fungsi aslinya, sehingga tidak ada
+biaya tambahan sama sekali.
+"""
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+
+from telemetry import metrics
+
+PROFILE_MODE = os.environ.get('QUIZ_PROFILE', '').strip().lower()
+# Jumlah baris statistik cProfile yang ditulis per callback
+PROFILE_TOP = 15
+
+logger = logging.getLogger('quiz.profile')
+
+
+def profiled(func):
+    """Dekorator untuk callback tombol: mencatat lamanya (dan profil cProfile) ke log."""
+    if PROFILE_MODE not in ('time', 'cprofile'):
+        return func
+    logger.setLevel(logging.INFO)
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = cProfile.Profile() if PROFILE_MODE == 'cprofile' else None
+        start = time.perf_counter()
+        try:
+            if profile is None:
+                return func(*args, **kwargs)
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            metrics.observe('callback.' + name, elapsed)
+            fields = {'callback': name, 'ms': round(elapsed, 3)}
+            if profile is not None:
+                out = io.StringIO()
+                pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+                fields['profile'] = out.getvalue()
+            logger.info('callback', extra={'fields': fields})
+
+    return wrapper
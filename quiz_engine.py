@@ -0,0 +1,215 @@
+"""Logika kuis tanpa Tkinter, dipakai oleh GUI maupun driver headless.
+
+Driver headless untuk uji beban, misalnya::
+
+    python quiz_engine.py --sessions 5000 --questions 10000
+"""
+import argparse
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+
+from database import Database, QUESTIONS_DB_PATH
+from database.attempts import AttemptRecorder
+from database.cache import QuestionCache
+from database.questions import QuestionStream, insert_question, iter_question_batches, load_questions_by_ids
+from database.schema import migrate_questions_db
+from database.selection import DEFAULT_QUIZ_SIZE, select_question_ids
+
+
+def iter_questions(db, batch_size=20, cache=None):
+    """Sumber soal tanpa thread: batch berikutnya dibaca saat dibutuhkan."""
+    for batch in iter_question_batches(db, batch_size, cache):
+        yield from batch
+
+
+class QuizSession:
+    """State satu sesi kuis: soal saat ini, nomor soal, dan skor.
+
+    Jika ``recorder`` diberikan, setiap jawaban dicatat ke buffer
+    AttemptRecorder; penulisan ke database dilakukan pemanggil lewat flush().
+    ``ready`` bernilai False selama soal berikutnya belum tersedia setelah
+    ``answer(..., wait=False)``; pemanggil lalu mencoba lagi lewat advance().
+    """
+
+    __slots__ = ('source', 'current', 'index', 'score', 'total', 'recorder', 'ready')
+
+    def __init__(self, source, total=None, recorder=None):
+        self.source = source
+        self.index = 0
+        self.score = 0
+        self.total = total
+        self.recorder = recorder
+        self.current = next(source, None)
+        self.ready = True
+
+    @property
+    def finished(self):
+        return self.ready and self.current is None
+
+    def question_total(self):
+        """Jumlah soal jika sudah diketahui, atau None."""
+        if self.total is None:
+            return getattr(self.source, 'total', None)
+        return self.total
+
+    def answer(self, option_id, wait=True):
+        """Menjawab soal saat ini dengan id opsi, lalu maju ke soal berikutnya.
+
+        Dengan ``wait=False`` soal berikutnya tidak ditunggu (lihat advance()).
+        Mengembalikan True jika jawaban benar.
+        """
+        if not self.ready:
+            raise RuntimeError("Soal berikutnya belum tersedia.")
+        if self.current is None:
+            raise RuntimeError("Kuis sudah selesai.")
+        correct = option_id == self.current['correct_option']
+        if correct:
+            self.score += 1
+        if self.recorder is not None:
+            self.recorder.record(self.current['id'], option_id, correct)
+        self.index += 1
+        if wait:
+            self.current = next(self.source, None)
+        else:
+            self.advance()
+        return correct
+
+    def advance(self):
+        """Mengambil soal berikutnya tanpa menunggu; False jika sumber belum menyediakannya."""
+        next_nowait = getattr(self.source, 'next_nowait', None)
+        self.ready = True
+        if next_nowait is None:
+            self.current = next(self.source, None)
+            return True
+        try:
+            self.current = next_nowait()
+        except StopIteration:
+            self.current = None
+        except queue.Empty:
+            self.current = None
+            self.ready = False
+        return self.ready
+
+    def flush(self):
+        """Menulis jawaban yang masih di buffer; status selesai ikut dicatat jika kuis selesai."""
+        if self.recorder is not None:
+            self.recorder.flush(finished=self.finished)
+
+    def close(self):
+        close = getattr(self.source, 'close', None)
+        if close is not None:
+            close()
+
+
+class QuizEngine:
+    """Membuat sesi kuis dari satu database soal.
+
+    Jika ``cache`` (QuestionCache) diberikan, soal yang sudah pernah dimuat
+    diambil dari memori selama bank soal tidak berubah.
+    """
+
+    __slots__ = ('db', 'batch_size', 'cache')
+
+    def __init__(self, db, batch_size=20, cache=None):
+        self.db = db
+        self.batch_size = batch_size
+        self.cache = cache
+
+    @classmethod
+    def open(cls, path=QUESTIONS_DB_PATH):
+        """Membuka database soal bersama (dengan cache bersama) dan memastikan skemanya terbaru."""
+        db = Database.get(path)
+        migrate_questions_db(db)
+        return cls(db, cache=QuestionCache.get(db))
+
+    def start_session(self, prefetch=False, user_id=None, record=True, count=None, category=None,
+                      weighted=False):
+        """Memulai sesi baru; soal pertama langsung dibaca.
+
+        Tanpa ``count``/``category``/``weighted`` semua soal dimainkan menurut
+        urutan id. Dengan ``prefetch=True`` soal berikutnya dibaca oleh thread
+        latar belakang (dipakai GUI); tanpa itu soal dibaca saat dibutuhkan,
+        cocok untuk menjalankan ribuan sesi sekaligus dalam satu proses.
+
+        Jika salah satu opsi pemilihan diisi, ``count`` soal (bawaan
+        DEFAULT_QUIZ_SIZE) dipilih acak lewat indeks dan dimuat sekaligus.
+        """
+        recorder = AttemptRecorder(self.db, user_id) if record else None
+        if count is not None or category is not None or weighted:
+            ids = select_question_ids(self.db, count or DEFAULT_QUIZ_SIZE, category, weighted)
+            if self.cache is None:
+                questions = load_questions_by_ids(self.db, ids)
+            else:
+                questions = self.cache.questions(ids)
+            return QuizSession(iter(questions), total=len(questions), recorder=recorder)
+        if prefetch:
+            return QuizSession(QuestionStream(self.db, self.batch_size, cache=self.cache), recorder=recorder)
+        return QuizSession(iter_questions(self.db, self.batch_size, self.cache), recorder=recorder)
+
+
+def make_sample_db(path, count):
+    db = Database(path)
+    migrate_questions_db(db)
+    with db.transaction():
+        for i in range(count):
+            insert_question(db, f"Soal nomor {i}?", "A", ["A", "B", "C", "D"])
+    return db
+
+
+def run_sessions(engine, sessions, seed=0, record=False, **selection):
+    """Menjalankan banyak sesi bergantian (round-robin) sampai semuanya selesai.
+
+    Dengan ``record=True`` setiap sesi menyimpan hasilnya sekali saat selesai.
+    ``selection`` diteruskan ke start_session (count, category, weighted).
+    Mengembalikan (jumlah jawaban, detik).
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    active = [engine.start_session(record=record, **selection) for _ in range(sessions)]
+    active = [session for session in active if not session.finished]
+    answers = 0
+    while active:
+        still_active = []
+        for session in active:
+            option_id, _ = rng.choice(session.current['options'])
+            session.answer(option_id)
+            answers += 1
+            if not session.finished:
+                still_active.append(session)
+            else:
+                session.flush()
+        active = still_active
+    return answers, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Driver kuis headless untuk uji beban.")
+    parser.add_argument('--db', help="database soal; jika kosong dibuat database contoh sementara")
+    parser.add_argument('--questions', type=int, default=100, help="jumlah soal database contoh")
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--record', action='store_true', help="simpan percobaan dan jawaban ke database")
+    parser.add_argument('--count', type=int, help="jumlah soal acak per sesi (bawaan: semua soal berurutan)")
+    parser.add_argument('--category', help="hanya soal dari kategori ini")
+    parser.add_argument('--weighted', action='store_true', help="soal sulit lebih sering terpilih")
+    parser.add_argument('--cache', action='store_true', help="pakai cache soal di memori")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        engine = QuizEngine.open(args.db)
+    else:
+        engine = QuizEngine(make_sample_db(os.path.join(tempfile.mkdtemp(), 'questions.db'), args.questions))
+    engine.cache = QuestionCache.get(engine.db) if args.cache else None
+
+    answers, elapsed = run_sessions(engine, args.sessions, record=args.record, count=args.count,
+                                    category=args.category, weighted=args.weighted)
+    print(f"{args.sessions} sesi, {answers} jawaban dalam {elapsed:.2f} s "
+          f"({answers / elapsed:.0f} jawaban/s, {args.sessions / elapsed:.1f} sesi/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
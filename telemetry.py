@@ -0,0 +1,160 @@
+"""Logging terstruktur (JSON) lewat antrean dan metrik latensi/counter sederhana.
+
+``setup_logging`` memasang QueueHandler di root logger; penulisan ke file
+dilakukan oleh QueueListener di thread sendiri, sehingga memanggil logging
+dari thread GUI tidak pernah menunggu disk. File log dirotasi otomatis.
+
+Contoh satu baris di app.log::
+
+    {"time": "2024-05-01T10:00:00.123", "level": "INFO", "logger": "quiz",
+     "message": "login", "thread": "MainThread", "ok": true}
+"""
+import atexit
+import bisect
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_PATH = 'app.log'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# Batas atas bucket histogram latensi dalam milidetik; bucket terakhir tak terbatas
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+logger = logging.getLogger('quiz')
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record log menjadi satu baris JSON; isi ``extra={'fields': {...}}`` ikut disertakan."""
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(path=LOG_PATH, level=logging.INFO, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """Memasang pipeline QueueHandler -> QueueListener -> RotatingFileHandler (sekali per proses)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                        encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Menulis sisa antrean ke file lalu menghentikan thread listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_event(event, level=logging.INFO, **fields):
+    """Mencatat satu kejadian dengan field terstruktur, mis. ``log_event('login', ok=True)``."""
+    logger.log(level, event, extra={'fields': fields})
+
+
+class Histogram:
+    """Histogram latensi dengan bucket tetap; persentil diperkirakan dari batas bucket."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return 0.0
+
+    def snapshot(self):
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class Metrics:
+    """Counter dan histogram latensi per operasi; aman dipakai dari banyak thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.latencies = {}
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, milliseconds):
+        with self._lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = Histogram()
+            histogram.observe(milliseconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'latency_ms': {name: histogram.snapshot() for name, histogram in self.latencies.items()},
+            }
+
+    def log_snapshot(self):
+        log_event('metrics', **self.snapshot())
+
+
+# Metrik bersama untuk seluruh proses
+metrics = Metrics()